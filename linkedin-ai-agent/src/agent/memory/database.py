@@ -5,16 +5,183 @@ SQLite storage for posts, engagement metrics, and learned insights.
 """
 
 import os
+import secrets
 import sqlite3
-import uuid
-from datetime import datetime
+import threading
+from collections import namedtuple
+from functools import lru_cache
 from typing import Optional
 from contextlib import contextmanager
 
 
+# Write statements, kept as constants so the connection's statement
+# cache reuses their compiled form across calls
+SQL_INSERT_POST = """
+    INSERT INTO posts (id, chat_id, repo_url, content, trend_matched, reasoning)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+SQL_MARK_POST_PUBLISHED = """
+    UPDATE posts SET linkedin_post_id = ?, posted_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+SQL_UPSERT_METRICS = """
+    INSERT INTO metrics (id, post_id, likes, comments, shares, impressions)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(post_id) DO UPDATE SET
+        likes = excluded.likes,
+        comments = excluded.comments,
+        shares = excluded.shares,
+        impressions = excluded.impressions,
+        fetched_at = CURRENT_TIMESTAMP
+"""
+
+SQL_UPSERT_INSIGHT = """
+    INSERT INTO insights (id, chat_id, insight_type, insight_key, score, sample_size, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(chat_id, insight_type, insight_key) DO UPDATE SET
+        score = (score * sample_size + excluded.score) / (sample_size + 1),
+        sample_size = sample_size + 1,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+# Inserts only while the user is below the 5-repo limit
+SQL_INSERT_REPO = """
+    INSERT INTO user_repos (id, chat_id, repo_url)
+    SELECT ?, ?, ?
+    WHERE (SELECT COUNT(*) FROM user_repos WHERE chat_id = ?) < 5
+"""
+
+SQL_UPDATE_REPO_INDEXED = """
+    UPDATE user_repos SET last_indexed_at = CURRENT_TIMESTAMP
+    WHERE chat_id = ? AND repo_url = ?
+"""
+
+# One draft per chat; a new one replaces the old
+SQL_UPSERT_DRAFT = """
+    INSERT INTO drafts (chat_id, content, repo_url)
+    VALUES (?, ?, ?)
+    ON CONFLICT(chat_id) DO UPDATE SET
+        content = excluded.content,
+        repo_url = excluded.repo_url,
+        created_at = CURRENT_TIMESTAMP
+"""
+
+SQL_DELETE_EXPIRED_DRAFTS = """
+    DELETE FROM drafts WHERE created_at < datetime('now', ?)
+"""
+
+
+# Whole schema applied in one transaction at startup
+SCHEMA_SQL = """
+BEGIN IMMEDIATE;
+
+-- Posts table
+CREATE TABLE IF NOT EXISTS posts (
+    id TEXT PRIMARY KEY,
+    chat_id TEXT NOT NULL,
+    repo_url TEXT,
+    content TEXT NOT NULL,
+    trend_matched TEXT,
+    linkedin_post_id TEXT,
+    reasoning TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    posted_at TIMESTAMP
+);
+
+-- Engagement metrics table
+CREATE TABLE IF NOT EXISTS metrics (
+    id TEXT PRIMARY KEY,
+    post_id TEXT NOT NULL,
+    likes INTEGER DEFAULT 0,
+    comments INTEGER DEFAULT 0,
+    shares INTEGER DEFAULT 0,
+    impressions INTEGER DEFAULT 0,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (post_id) REFERENCES posts(id)
+);
+
+-- Learned insights table
+CREATE TABLE IF NOT EXISTS insights (
+    id TEXT PRIMARY KEY,
+    chat_id TEXT NOT NULL,
+    insight_type TEXT NOT NULL,
+    insight_key TEXT NOT NULL,
+    score REAL DEFAULT 0.0,
+    sample_size INTEGER DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(chat_id, insight_type, insight_key)
+);
+
+-- User repos table (supports 1-5 repos per user)
+CREATE TABLE IF NOT EXISTS user_repos (
+    id TEXT PRIMARY KEY,
+    chat_id TEXT NOT NULL,
+    repo_url TEXT NOT NULL,
+    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_indexed_at TIMESTAMP,
+    UNIQUE(chat_id, repo_url)
+);
+
+-- Drafts awaiting approval (one per user, kept across restarts)
+CREATE TABLE IF NOT EXISTS drafts (
+    chat_id TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    repo_url TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_drafts_created_at ON drafts(created_at);
+-- One metrics row per post (enables the UPSERT in update_metrics)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_metrics_post_id_unique ON metrics(post_id);
+
+-- Composite/covering indexes for the hot read paths
+CREATE INDEX IF NOT EXISTS idx_posts_chat_posted ON posts(chat_id, posted_at DESC);
+CREATE INDEX IF NOT EXISTS idx_metrics_postid_cov ON metrics(post_id, likes, comments, shares, impressions);
+-- Score before sample_size: the sample_size filter is a range, and a range
+-- column would stop the index from also serving ORDER BY score
+CREATE INDEX IF NOT EXISTS idx_insights_chat_score_sample ON insights(chat_id, score DESC, sample_size);
+CREATE INDEX IF NOT EXISTS idx_insights_chat_type_score_sample ON insights(chat_id, insight_type, score DESC, sample_size);
+
+-- Covered or superseded by the indexes above (or the UNIQUE constraints),
+-- so they only cost writes
+DROP INDEX IF EXISTS idx_posts_chat_id;
+DROP INDEX IF EXISTS idx_metrics_post_id;
+DROP INDEX IF EXISTS idx_insights_chat_id;
+DROP INDEX IF EXISTS idx_insights_chat_type_score;
+DROP INDEX IF EXISTS idx_insights_chat_sample_score;
+DROP INDEX IF EXISTS idx_insights_chat_type_sample_score;
+DROP INDEX IF EXISTS idx_user_repos_chat_id;
+
+-- Refresh planner statistics so the new indexes get picked
+ANALYZE;
+
+COMMIT;
+"""
+
+
+# Lightweight row types for list reads (cheaper than a dict per row)
+POST_COLUMNS = "id chat_id repo_url content trend_matched linkedin_post_id reasoning created_at posted_at"
+Post = namedtuple("Post", POST_COLUMNS)
+PostWithMetrics = namedtuple("PostWithMetrics", POST_COLUMNS + " likes comments shares impressions")
+
+# Same column order as the tuples above
+SQL_POST_COLUMNS = ", ".join(POST_COLUMNS.split())
+SQL_POST_COLUMNS_P = ", ".join("p." + c for c in POST_COLUMNS.split())
+
+
 class Database:
     """SQLite database for agent memory."""
 
+    # Bumped on every insight write. Part of the insight read-cache key, and
+    # shared by all instances so a write through one invalidates the others.
+    _insights_version = 0
+
+    # Same scheme for the repo list, bumped whenever a repo is added or removed
+    _repos_version = 0
+
     def __init__(self, db_path: str = None):
         """
         Initialize database connection.
@@ -23,87 +190,119 @@ class Database:
             db_path: Path to SQLite database file. Defaults to ./agent_memory.db
         """
         self.db_path = db_path or os.getenv("AGENT_DB_PATH", "./agent_memory.db")
+
+        # One long-lived connection; transactions are managed explicitly
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._configure_connection()
+
+        # Insight reads are cached per (chat_id, insight_type, min_sample_size, version)
+        self._insights_cache = lru_cache(maxsize=256)(self._query_insights)
+
+        # Repo lists are cached per (chat_id, version)
+        self._repos_cache = lru_cache(maxsize=1024)(self._query_repos)
+
         self._init_tables()
 
+    def _configure_connection(self):
+        """Apply PRAGMA tuning once for the lifetime of the connection."""
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-65536")
+        self._conn.execute("PRAGMA mmap_size=268435456")
+
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Context manager yielding the shared connection inside a write transaction."""
+        with self._lock:
+            conn = self._conn
+
+            # Already inside an outer transaction - let it commit
+            if conn.in_transaction:
+                yield conn
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    @contextmanager
+    def _read_connection(self):
+        """
+        Context manager yielding the shared connection for read-only queries.
+
+        No explicit transaction - a lone SELECT reads a WAL snapshot without
+        taking the write lock other Database instances need.
+        """
+        with self._lock:
+            yield self._conn
+
+    def begin(self):
+        """
+        Start an explicit transaction spanning several calls.
+
+        Must be paired with commit() or rollback() on the same thread.
+        """
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            # e.g. SQLITE_BUSY - no transaction was opened, so don't keep the lock
+            self._lock.release()
+            raise
+
+    def commit(self):
+        """Commit the transaction opened with begin(), rolling it back if that fails."""
         try:
-            yield conn
-            conn.commit()
+            self._conn.execute("COMMIT")
         except Exception:
-            conn.rollback()
+            # Never leave the transaction open for the next caller to join
+            self.rollback()
             raise
+        self._lock.release()
+
+    def rollback(self):
+        """Roll back the transaction opened with begin()."""
+        try:
+            self._conn.execute("ROLLBACK")
         finally:
-            conn.close()
+            # Drop anything cached from inside the discarded transaction
+            self._bump_insights_version()
+            Database._repos_version += 1
+            self._lock.release()
+
+    def close(self):
+        """Refresh planner stats and close the database connection."""
+        with self._lock:
+            try:
+                # Cheap: only re-analyzes tables whose stats have drifted
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass  # Already closed
+            self._conn.close()
 
     def _init_tables(self):
         """Create database tables if they don't exist."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Posts table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS posts (
-                    id TEXT PRIMARY KEY,
-                    chat_id TEXT NOT NULL,
-                    repo_url TEXT,
-                    content TEXT NOT NULL,
-                    trend_matched TEXT,
-                    linkedin_post_id TEXT,
-                    reasoning TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    posted_at TIMESTAMP
-                )
-            """)
-
-            # Engagement metrics table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS metrics (
-                    id TEXT PRIMARY KEY,
-                    post_id TEXT NOT NULL,
-                    likes INTEGER DEFAULT 0,
-                    comments INTEGER DEFAULT 0,
-                    shares INTEGER DEFAULT 0,
-                    impressions INTEGER DEFAULT 0,
-                    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (post_id) REFERENCES posts(id)
-                )
-            """)
-
-            # Learned insights table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS insights (
-                    id TEXT PRIMARY KEY,
-                    chat_id TEXT NOT NULL,
-                    insight_type TEXT NOT NULL,
-                    insight_key TEXT NOT NULL,
-                    score REAL DEFAULT 0.0,
-                    sample_size INTEGER DEFAULT 0,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(chat_id, insight_type, insight_key)
-                )
-            """)
-
-            # User repos table (supports 1-5 repos per user)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS user_repos (
-                    id TEXT PRIMARY KEY,
-                    chat_id TEXT NOT NULL,
-                    repo_url TEXT NOT NULL,
-                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_indexed_at TIMESTAMP,
-                    UNIQUE(chat_id, repo_url)
-                )
-            """)
-
-            # Create indexes
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_chat_id ON posts(chat_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_metrics_post_id ON metrics(post_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_insights_chat_id ON insights(chat_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_repos_chat_id ON user_repos(chat_id)")
+        with self._lock:
+            # executescript commits any open transaction, so the script
+            # carries its own BEGIN/COMMIT instead of using _get_connection
+            try:
+                self._conn.executescript(SCHEMA_SQL)
+            except Exception:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
 
     # ==================== Posts ====================
 
@@ -121,13 +320,10 @@ class Database:
         Returns:
             Post ID
         """
-        post_id = str(uuid.uuid4())
+        post_id = secrets.token_hex(16)
         with self._get_connection() as conn:
             conn.execute(
-                """
-                INSERT INTO posts (id, chat_id, repo_url, content, trend_matched, reasoning)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
+                SQL_INSERT_POST,
                 (post_id, chat_id, repo_url, content, trend_matched, reasoning)
             )
         return post_id
@@ -136,37 +332,41 @@ class Database:
         """Mark a post as published to LinkedIn."""
         with self._get_connection() as conn:
             conn.execute(
-                """
-                UPDATE posts SET linkedin_post_id = ?, posted_at = ?
-                WHERE id = ?
-                """,
-                (linkedin_post_id, datetime.utcnow(), post_id)
+                SQL_MARK_POST_PUBLISHED,
+                (linkedin_post_id, post_id)
             )
 
     def get_post(self, post_id: str) -> Optional[dict]:
         """Get a post by ID."""
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             row = conn.execute(
                 "SELECT * FROM posts WHERE id = ?", (post_id,)
             ).fetchone()
             return dict(row) if row else None
 
-    def get_recent_posts(self, chat_id: str, limit: int = 10) -> list[dict]:
+    def get_recent_posts(self, chat_id: str, limit: int = 10) -> list[Post]:
         """Get recent posts for a user."""
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             rows = conn.execute(
-                """
-                SELECT * FROM posts WHERE chat_id = ?
+                f"""
+                SELECT {SQL_POST_COLUMNS} FROM posts WHERE chat_id = ?
                 ORDER BY created_at DESC LIMIT ?
                 """,
                 (chat_id, limit)
             ).fetchall()
-            return [dict(row) for row in rows]
+            return [Post._make(row) for row in rows]
 
     def get_last_post(self, chat_id: str) -> Optional[dict]:
         """Get the most recent post for a user."""
-        posts = self.get_recent_posts(chat_id, limit=1)
-        return posts[0] if posts else None
+        with self._read_connection() as conn:
+            row = conn.execute(
+                """
+                SELECT * FROM posts WHERE chat_id = ?
+                ORDER BY created_at DESC LIMIT 1
+                """,
+                (chat_id,)
+            ).fetchone()
+            return dict(row) if row else None
 
     # ==================== Metrics ====================
 
@@ -179,33 +379,27 @@ class Database:
         impressions: int = 0
     ):
         """Update engagement metrics for a post."""
-        metric_id = str(uuid.uuid4())
+        metric_id = secrets.token_hex(16)
         with self._get_connection() as conn:
-            # Delete old metrics for this post
-            conn.execute("DELETE FROM metrics WHERE post_id = ?", (post_id,))
-            # Insert new metrics
             conn.execute(
-                """
-                INSERT INTO metrics (id, post_id, likes, comments, shares, impressions)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
+                SQL_UPSERT_METRICS,
                 (metric_id, post_id, likes, comments, shares, impressions)
             )
 
     def get_metrics(self, post_id: str) -> Optional[dict]:
         """Get metrics for a post."""
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             row = conn.execute(
                 "SELECT * FROM metrics WHERE post_id = ?", (post_id,)
             ).fetchone()
             return dict(row) if row else None
 
-    def get_posts_with_metrics(self, chat_id: str, limit: int = 20) -> list[dict]:
-        """Get posts with their engagement metrics."""
-        with self._get_connection() as conn:
+    def get_posts_with_metrics(self, chat_id: str, limit: int = 20) -> list[PostWithMetrics]:
+        """Get posts with their engagement metrics (None metrics if not fetched yet)."""
+        with self._read_connection() as conn:
             rows = conn.execute(
-                """
-                SELECT p.*, m.likes, m.comments, m.shares, m.impressions
+                f"""
+                SELECT {SQL_POST_COLUMNS_P}, m.likes, m.comments, m.shares, m.impressions
                 FROM posts p
                 LEFT JOIN metrics m ON p.id = m.post_id
                 WHERE p.chat_id = ? AND p.posted_at IS NOT NULL
@@ -214,7 +408,21 @@ class Database:
                 """,
                 (chat_id, limit)
             ).fetchall()
-            return [dict(row) for row in rows]
+            return [PostWithMetrics._make(row) for row in rows]
+
+    def get_post_with_metrics(self, post_id: str) -> Optional[PostWithMetrics]:
+        """Get a single post joined with its metrics (None metrics if not fetched yet)."""
+        with self._read_connection() as conn:
+            row = conn.execute(
+                f"""
+                SELECT {SQL_POST_COLUMNS_P}, m.likes, m.comments, m.shares, m.impressions
+                FROM posts p
+                LEFT JOIN metrics m ON p.id = m.post_id
+                WHERE p.id = ?
+                """,
+                (post_id,)
+            ).fetchone()
+            return PostWithMetrics._make(row) if row else None
 
     # ==================== Insights ====================
 
@@ -227,46 +435,97 @@ class Database:
         sample_size: int = 1
     ):
         """Update or create an insight."""
-        insight_id = str(uuid.uuid4())
+        insight_id = secrets.token_hex(16)
         with self._get_connection() as conn:
             conn.execute(
-                """
-                INSERT INTO insights (id, chat_id, insight_type, insight_key, score, sample_size, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(chat_id, insight_type, insight_key) DO UPDATE SET
-                    score = (score * sample_size + excluded.score) / (sample_size + 1),
-                    sample_size = sample_size + 1,
-                    updated_at = excluded.updated_at
-                """,
-                (insight_id, chat_id, insight_type, insight_key, score, sample_size, datetime.utcnow())
+                SQL_UPSERT_INSIGHT,
+                (insight_id, chat_id, insight_type, insight_key, score, sample_size)
             )
+        self._bump_insights_version()
+
+    def update_insights_bulk(self, rows: list[tuple]):
+        """
+        Update or create many insights in one statement batch.
 
-    def get_insights(self, chat_id: str, insight_type: str = None) -> list[dict]:
-        """Get insights for a user, optionally filtered by type."""
+        Args:
+            rows: (chat_id, insight_type, insight_key, score) tuples
+        """
         with self._get_connection() as conn:
+            conn.executemany(
+                SQL_UPSERT_INSIGHT,
+                [
+                    (secrets.token_hex(16), chat_id, insight_type, insight_key, score, 1)
+                    for chat_id, insight_type, insight_key, score in rows
+                ]
+            )
+        self._bump_insights_version()
+
+    @staticmethod
+    def _bump_insights_version():
+        """Invalidate cached insight reads."""
+        Database._insights_version += 1
+
+    def get_insights(
+        self,
+        chat_id: str,
+        insight_type: str = None,
+        min_sample_size: int = 0
+    ) -> list[dict]:
+        """
+        Get insights for a user, best first.
+
+        Args:
+            chat_id: User's chat ID
+            insight_type: Only return this type (all types, grouped by type, if None)
+            min_sample_size: Skip insights backed by fewer posts than this
+        """
+        rows = self._insights_cache(
+            chat_id, insight_type, min_sample_size, Database._insights_version
+        )
+        # Fresh dicts - the cached rows are shared by every caller
+        return [dict(row) for row in rows]
+
+    def _query_insights(
+        self,
+        chat_id: str,
+        insight_type: str,
+        min_sample_size: int,
+        version: int
+    ) -> tuple[dict, ...]:
+        """Load insights from SQLite (called through the version-keyed cache)."""
+        with self._read_connection() as conn:
             if insight_type:
                 rows = conn.execute(
                     """
                     SELECT * FROM insights
-                    WHERE chat_id = ? AND insight_type = ?
+                    WHERE chat_id = ? AND insight_type = ? AND sample_size >= ?
                     ORDER BY score DESC
                     """,
-                    (chat_id, insight_type)
+                    (chat_id, insight_type, min_sample_size)
                 ).fetchall()
             else:
                 rows = conn.execute(
                     """
                     SELECT * FROM insights
-                    WHERE chat_id = ?
+                    WHERE chat_id = ? AND sample_size >= ?
                     ORDER BY insight_type, score DESC
                     """,
-                    (chat_id,)
+                    (chat_id, min_sample_size)
                 ).fetchall()
-            return [dict(row) for row in rows]
+            return tuple(dict(row) for row in rows)
+
+    def get_all_insights_ranked(self, chat_id: str) -> list[dict]:
+        """
+        Get every insight with at least 2 samples in one query.
+
+        Returns:
+            List of insight dicts ordered by insight_type, then score (best first)
+        """
+        return self.get_insights(chat_id, min_sample_size=2)
 
     def get_top_insights(self, chat_id: str, limit: int = 5) -> list[dict]:
         """Get top-performing insights across all types."""
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             rows = conn.execute(
                 """
                 SELECT * FROM insights
@@ -287,28 +546,22 @@ class Database:
         Returns:
             (success, message)
         """
-        # Check current count
+        repo_id = secrets.token_hex(16)
         with self._get_connection() as conn:
-            count = conn.execute(
-                "SELECT COUNT(*) FROM user_repos WHERE chat_id = ?", (chat_id,)
-            ).fetchone()[0]
-
-            if count >= 5:
-                return False, "Maximum 5 repos allowed. Remove one first with /removerepo"
-
             try:
-                repo_id = str(uuid.uuid4())
-                conn.execute(
-                    """
-                    INSERT INTO user_repos (id, chat_id, repo_url)
-                    VALUES (?, ?, ?)
-                    """,
-                    (repo_id, chat_id, repo_url)
+                cursor = conn.execute(
+                    SQL_INSERT_REPO,
+                    (repo_id, chat_id, repo_url, chat_id)
                 )
-                return True, f"Added repo: {repo_url}"
             except sqlite3.IntegrityError:
                 return False, "Repo already added"
 
+            # Nothing inserted means the count guard rejected the row
+            if cursor.rowcount == 0:
+                return False, "Maximum 5 repos allowed. Remove one first with /removerepo"
+        Database._repos_version += 1
+        return True, f"Added repo: {repo_url}"
+
     def remove_repo(self, chat_id: str, repo_url: str) -> tuple[bool, str]:
         """Remove a repository for a user."""
         with self._get_connection() as conn:
@@ -316,26 +569,70 @@ class Database:
                 "DELETE FROM user_repos WHERE chat_id = ? AND repo_url = ?",
                 (chat_id, repo_url)
             )
-            if cursor.rowcount > 0:
-                return True, f"Removed repo: {repo_url}"
-            return False, "Repo not found"
+            if cursor.rowcount == 0:
+                return False, "Repo not found"
+        Database._repos_version += 1
+        return True, f"Removed repo: {repo_url}"
 
     def get_repos(self, chat_id: str) -> list[str]:
         """Get all repos for a user."""
-        with self._get_connection() as conn:
+        return list(self._repos_cache(chat_id, Database._repos_version))
+
+    def _query_repos(self, chat_id: str, version: int) -> tuple[str, ...]:
+        """Load a user's repos from SQLite (called through the version-keyed cache)."""
+        with self._read_connection() as conn:
             rows = conn.execute(
                 "SELECT repo_url FROM user_repos WHERE chat_id = ? ORDER BY added_at",
                 (chat_id,)
             ).fetchall()
-            return [row["repo_url"] for row in rows]
+            return tuple(row["repo_url"] for row in rows)
 
     def update_repo_indexed(self, chat_id: str, repo_url: str):
         """Mark a repo as recently indexed."""
         with self._get_connection() as conn:
             conn.execute(
+                SQL_UPDATE_REPO_INDEXED,
+                (chat_id, repo_url)
+            )
+
+    # ==================== Drafts ====================
+
+    def save_draft(self, chat_id: str, content: str, repo_url: str = None, max_age_hours: int = 24):
+        """
+        Store the draft a user should approve next, replacing any older one.
+
+        Drafts older than max_age_hours (from any user) are swept at the same time.
+
+        Args:
+            chat_id: User's chat ID
+            content: Post text
+            repo_url: Repository the post is about
+            max_age_hours: How long drafts are kept
+        """
+        with self._get_connection() as conn:
+            conn.execute(SQL_DELETE_EXPIRED_DRAFTS, (f"-{max_age_hours} hours",))
+            conn.execute(SQL_UPSERT_DRAFT, (chat_id, content, repo_url))
+
+    def get_draft(self, chat_id: str, max_age_hours: int = 24) -> Optional[dict]:
+        """
+        Get a user's draft if it's younger than max_age_hours.
+
+        Returns:
+            Dict with content, repo_url and age_seconds, or None
+        """
+        with self._read_connection() as conn:
+            row = conn.execute(
                 """
-                UPDATE user_repos SET last_indexed_at = ?
-                WHERE chat_id = ? AND repo_url = ?
+                SELECT content, repo_url,
+                       (julianday('now') - julianday(created_at)) * 86400 AS age_seconds
+                FROM drafts
+                WHERE chat_id = ? AND created_at >= datetime('now', ?)
                 """,
-                (datetime.utcnow(), chat_id, repo_url)
-            )
+                (chat_id, f"-{max_age_hours} hours")
+            ).fetchone()
+            return dict(row) if row else None
+
+    def delete_draft(self, chat_id: str):
+        """Remove a user's draft (once it's been approved or discarded)."""
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM drafts WHERE chat_id = ?", (chat_id,))
@@ -4,8 +4,11 @@ Insight Learner
 Extracts patterns from post performance to improve future content strategy.
 """
 
+from collections import defaultdict
+from operator import itemgetter
 from typing import Optional
 from .database import Database
+from ..utils import repo_short_name
 
 
 class InsightLearner:
@@ -49,6 +52,19 @@ class InsightLearner:
         engagement_rate = ((likes + comments * 3 + shares * 2) / impressions) * 100
         return min(100, engagement_rate * 10)  # Scale up for readability
 
+    def calculate_engagement_scores(self, metrics_rows: list[tuple]) -> list[float]:
+        """
+        Score many posts at once.
+
+        Args:
+            metrics_rows: List of (likes, comments, shares, impressions) tuples
+
+        Returns:
+            Engagement scores in the same order
+        """
+        score = self.calculate_engagement_score
+        return [score(*metrics) for metrics in metrics_rows]
+
     def learn_from_post(self, post_id: str, chat_id: str):
         """
         Extract insights from a post's performance.
@@ -58,73 +74,93 @@ class InsightLearner:
         - Repo performance (which repos get engagement)
         - Content patterns (length, code snippets, etc.)
         """
-        post = self.db.get_post(post_id)
-        metrics = self.db.get_metrics(post_id)
+        post = self.db.get_post_with_metrics(post_id)
 
-        if not post or not metrics:
+        if not post or post.likes is None:
             return
 
         score = self.calculate_engagement_score(
-            likes=metrics.get("likes", 0),
-            comments=metrics.get("comments", 0),
-            shares=metrics.get("shares", 0),
-            impressions=metrics.get("impressions", 0)
+            likes=post.likes,
+            comments=post.comments,
+            shares=post.shares,
+            impressions=post.impressions
         )
 
+        self.db.update_insights_bulk(self._insight_rows(
+            chat_id, score, post.trend_matched, post.repo_url, post.content
+        ))
+
+    def _insight_rows(
+        self,
+        chat_id: str,
+        score: float,
+        trend_matched: Optional[str],
+        repo_url: Optional[str],
+        content: Optional[str]
+    ) -> list[tuple]:
+        """
+        Build the insight rows a post contributes.
+
+        Returns:
+            List of (chat_id, insight_type, insight_key, score) tuples
+        """
+        rows = []
+
         # Learn topic performance
-        if post.get("trend_matched"):
-            self.db.update_insight(
-                chat_id=chat_id,
-                insight_type="topic",
-                insight_key=post["trend_matched"].lower(),
-                score=score
-            )
+        if trend_matched:
+            rows.append((chat_id, "topic", trend_matched.lower(), score))
 
         # Learn repo performance
-        if post.get("repo_url"):
-            # Extract repo name from URL
-            repo_name = post["repo_url"].rstrip("/").split("/")[-1]
-            self.db.update_insight(
-                chat_id=chat_id,
-                insight_type="repo",
-                insight_key=repo_name,
-                score=score
-            )
+        if repo_url:
+            repo_name = repo_short_name(repo_url)
+            rows.append((chat_id, "repo", repo_name, score))
 
         # Learn content style
-        content = post.get("content", "")
+        content = content or ""
 
         # Has code snippet?
         has_code = "```" in content
-        self.db.update_insight(
-            chat_id=chat_id,
-            insight_type="style",
-            insight_key="with_code" if has_code else "no_code",
-            score=score
-        )
+        rows.append((chat_id, "style", "with_code" if has_code else "no_code", score))
 
-        # Content length
-        word_count = len(content.split())
+        # Content length - buckets stop at 250 words, so never split further than that
+        word_count = len(content.split(maxsplit=250))
         if word_count < 100:
             length_key = "short"
         elif word_count < 250:
             length_key = "medium"
         else:
             length_key = "long"
-        self.db.update_insight(
-            chat_id=chat_id,
-            insight_type="length",
-            insight_key=length_key,
-            score=score
-        )
+        rows.append((chat_id, "length", length_key, score))
+
+        return rows
 
     def process_all_pending(self, chat_id: str):
         """Process all posts with metrics that haven't been learned from."""
-        posts_with_metrics = self.db.get_posts_with_metrics(chat_id, limit=50)
-
-        for post in posts_with_metrics:
-            if post.get("likes") is not None:  # Has metrics
-                self.learn_from_post(post["id"], chat_id)
+        self.db.begin()
+        try:
+            # Posts already come joined with their metrics - no per-post lookups
+            posts_with_metrics = self.db.get_posts_with_metrics(chat_id, limit=50)
+
+            # Skip posts with no metrics yet
+            scored_posts = [p for p in posts_with_metrics if p.likes is not None]
+            scores = self.calculate_engagement_scores([
+                (p.likes, p.comments or 0, p.shares or 0, p.impressions or 0)
+                for p in scored_posts
+            ])
+
+            rows = []
+            for post, score in zip(scored_posts, scores):
+                rows.extend(self._insight_rows(
+                    chat_id, score, post.trend_matched, post.repo_url, post.content
+                ))
+
+            if rows:
+                self.db.update_insights_bulk(rows)
+        except Exception:
+            self.db.rollback()
+            raise
+
+        self.db.commit()
 
     def get_content_recommendations(self, chat_id: str) -> dict:
         """
@@ -141,33 +177,32 @@ class InsightLearner:
             "summary": ""
         }
 
+        # One query for every type, then bucket (rows arrive score-ordered)
+        insights_by_type = defaultdict(list)
+        for insight in self.db.get_all_insights_ranked(chat_id):
+            insights_by_type[insight["insight_type"]].append(insight)
+
         # Get top topics
-        topic_insights = self.db.get_insights(chat_id, "topic")
-        if topic_insights:
-            recommendations["topics"] = [
-                {"topic": i["insight_key"], "score": i["score"]}
-                for i in topic_insights[:5]
-                if i["sample_size"] >= 2
-            ]
+        recommendations["topics"] = [
+            {"topic": i["insight_key"], "score": i["score"]}
+            for i in insights_by_type["topic"][:5]
+        ]
 
         # Get best style
-        style_insights = self.db.get_insights(chat_id, "style")
-        if style_insights and style_insights[0]["sample_size"] >= 3:
+        style_insights = [i for i in insights_by_type["style"] if i["sample_size"] >= 3]
+        if style_insights:
             recommendations["style"] = style_insights[0]["insight_key"]
 
         # Get best length
-        length_insights = self.db.get_insights(chat_id, "length")
-        if length_insights and length_insights[0]["sample_size"] >= 3:
+        length_insights = [i for i in insights_by_type["length"] if i["sample_size"] >= 3]
+        if length_insights:
             recommendations["length"] = length_insights[0]["insight_key"]
 
         # Get best repos
-        repo_insights = self.db.get_insights(chat_id, "repo")
-        if repo_insights:
-            recommendations["repos"] = [
-                {"repo": i["insight_key"], "score": i["score"]}
-                for i in repo_insights[:3]
-                if i["sample_size"] >= 2
-            ]
+        recommendations["repos"] = [
+            {"repo": i["insight_key"], "score": i["score"]}
+            for i in insights_by_type["repo"][:3]
+        ]
 
         # Generate summary
         summary_parts = []
@@ -208,10 +243,10 @@ class InsightLearner:
         repo_scores = {i["insight_key"]: i["score"] for i in repo_insights}
 
         # Score available repos
+        score_for = repo_scores.get
         scored_repos = []
         for repo_url in available_repos:
-            repo_name = repo_url.rstrip("/").split("/")[-1]
-            score = repo_scores.get(repo_name, 50)  # Default score
+            score = score_for(repo_short_name(repo_url), 50)  # Default score
 
             # Penalize if same as last post
             if repo_url == last_repo_url:
@@ -219,6 +254,5 @@ class InsightLearner:
 
             scored_repos.append((repo_url, score))
 
-        # Sort by score and return best
-        scored_repos.sort(key=lambda x: x[1], reverse=True)
-        return scored_repos[0][0]
+        # Return the best scoring repo (first one wins ties)
+        return max(scored_repos, key=itemgetter(1))[0]
@@ -4,7 +4,10 @@ Content Strategist Agent
 ReAct-based agent that autonomously decides what content to create.
 """
 
+import atexit
 import os
+import threading
+from functools import cached_property
 from typing import Optional
 from langchain_openai import ChatOpenAI
 from langchain.agents import AgentExecutor, create_react_agent
@@ -14,16 +17,7 @@ from dotenv import load_dotenv
 
 from .memory.database import Database
 from .memory.learner import InsightLearner
-from .tools.trends import fetch_trends_tool, get_all_trends_tool
-from .tools.repos import list_repos_tool, analyze_repo_tool, compare_repos_tool
-from .tools.matching import match_trends_tool, search_code_tool, find_best_content_match
-from .tools.history import (
-    get_post_history_tool,
-    get_insights_tool,
-    get_last_post_reasoning_tool,
-    suggest_next_post_tool
-)
-from .tools.publisher import generate_post_tool, generate_post_with_insights_tool
+from .utils import truncate
 
 load_dotenv()
 
@@ -86,29 +80,65 @@ class ContentStrategist:
             max_iterations: Maximum reasoning steps
             verbose: Whether to print reasoning steps
         """
-        self.llm = ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
-
+        self.model = model
+        self.temperature = temperature
         self.max_iterations = int(os.getenv("AGENT_MAX_ITERATIONS", max_iterations))
         self.verbose = verbose
 
-        self.db = Database()
-        self.learner = InsightLearner(self.db)
+        # Agent executors per chat_id (they only differ by the partialed prompt)
+        self._agent_cache = {}
+        self._agent_cache_lock = threading.Lock()
 
-        # Initialize tools
-        self.tools = self._create_tools()
+    # Heavy components are built on first use
 
-        # Create prompt
-        self.prompt = PromptTemplate(
+    @cached_property
+    def llm(self) -> ChatOpenAI:
+        """LLM driving the agent."""
+        return ChatOpenAI(
+            model=self.model,
+            temperature=self.temperature,
+            openai_api_key=os.getenv("OPENAI_API_KEY")
+        )
+
+    @cached_property
+    def db(self) -> Database:
+        """Agent memory database (closed, with PRAGMA optimize, at exit)."""
+        db = Database()
+        atexit.register(db.close)
+        return db
+
+    @cached_property
+    def learner(self) -> InsightLearner:
+        """Insight learner backed by the agent database."""
+        return InsightLearner(self.db)
+
+    @cached_property
+    def tools(self) -> list[Tool]:
+        """Tools available to the agent."""
+        return self._create_tools()
+
+    @cached_property
+    def prompt(self) -> PromptTemplate:
+        """ReAct prompt template."""
+        return PromptTemplate(
             template=REACT_PROMPT,
             input_variables=["input", "chat_id", "agent_scratchpad", "tools", "tool_names"]
         )
 
     def _create_tools(self) -> list[Tool]:
         """Create the list of tools available to the agent."""
+        # Imported here so tool modules (and their RAG/DB deps) load only when needed
+        from .tools.trends import fetch_trends_tool, get_all_trends_tool
+        from .tools.repos import list_repos_tool, analyze_repo_tool, compare_repos_tool
+        from .tools.matching import match_trends_tool, search_code_tool, find_best_content_match
+        from .tools.history import (
+            get_post_history_tool,
+            get_insights_tool,
+            get_last_post_reasoning_tool,
+            suggest_next_post_tool
+        )
+        from .tools.publisher import generate_post_tool, generate_post_with_insights_tool
+
         return [
             # Trend tools
             fetch_trends_tool,
@@ -136,23 +166,36 @@ class ContentStrategist:
         ]
 
     def _create_agent(self, chat_id: str) -> AgentExecutor:
-        """Create an agent executor for a specific chat."""
-        # Create the ReAct agent
-        agent = create_react_agent(
-            llm=self.llm,
-            tools=self.tools,
-            prompt=self.prompt.partial(chat_id=chat_id)
-        )
-
-        # Create executor with limits
-        return AgentExecutor(
-            agent=agent,
-            tools=self.tools,
-            verbose=self.verbose,
-            max_iterations=self.max_iterations,
-            handle_parsing_errors=True,
-            return_intermediate_steps=True
-        )
+        """Get the agent executor for a specific chat, building it on first use."""
+        # Chats run concurrently in worker threads; building under the lock
+        # also keeps the cached llm/tools/prompt from being built twice
+        with self._agent_cache_lock:
+            executor = self._agent_cache.get(chat_id)
+            if executor is not None:
+                return executor
+
+            # Keep the cache bounded - drop the oldest chat
+            if len(self._agent_cache) >= 128:
+                self._agent_cache.pop(next(iter(self._agent_cache)))
+
+            # Create the ReAct agent
+            agent = create_react_agent(
+                llm=self.llm,
+                tools=self.tools,
+                prompt=self.prompt.partial(chat_id=chat_id)
+            )
+
+            # Create executor with limits
+            executor = AgentExecutor(
+                agent=agent,
+                tools=self.tools,
+                verbose=self.verbose,
+                max_iterations=self.max_iterations,
+                handle_parsing_errors=True,
+                return_intermediate_steps=True
+            )
+            self._agent_cache[chat_id] = executor
+            return executor
 
     def run(self, chat_id: str, task: str) -> dict:
         """
@@ -178,7 +221,7 @@ class ContentStrategist:
                 reasoning.append({
                     "tool": action.tool,
                     "input": str(action.tool_input),
-                    "output": str(observation)[:200] + "..." if len(str(observation)) > 200 else str(observation)
+                    "output": truncate(str(observation), 200)
                 })
 
             return {
@@ -256,23 +299,32 @@ Return the generated post."""
         return self.run(chat_id, task)
 
 
+# Shared agent for the convenience functions
+_strategist = None
+
+
+def _get_strategist() -> ContentStrategist:
+    global _strategist
+    if _strategist is None:
+        _strategist = ContentStrategist()
+    return _strategist
+
+
 # Convenience functions for direct use
 def generate_post(chat_id: str, verbose: bool = False) -> dict:
     """Generate a daily post for a user."""
-    agent = ContentStrategist(verbose=verbose)
+    agent = ContentStrategist(verbose=True) if verbose else _get_strategist()
     return agent.generate_daily_post(chat_id)
 
 
 def explain_post(chat_id: str) -> dict:
     """Explain the last post's reasoning."""
-    agent = ContentStrategist()
-    return agent.explain_last_post(chat_id)
+    return _get_strategist().explain_last_post(chat_id)
 
 
 def get_suggestions(chat_id: str) -> dict:
     """Get content suggestions."""
-    agent = ContentStrategist()
-    return agent.get_content_suggestions(chat_id)
+    return _get_strategist().get_content_suggestions(chat_id)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+"""
+Shared Tool Dependencies
+
+Process-wide instances reused by every tool module, so the tools share one
+database connection, one retriever (and its vector store) and one post
+generator.
+"""
+
+import threading
+from typing import TYPE_CHECKING
+
+from agent.memory.database import Database
+from agent.memory.learner import InsightLearner
+
+# RAG/LLM deps are heavy - imported on first use
+if TYPE_CHECKING:
+    from generator.post_generator import PostGenerator
+    from rag.loader import RepoLoader
+    from rag.retriever import CodeRetriever
+
+
+# Global instances (initialized lazily)
+_db = None
+_learner = None
+_retriever = None
+_loader = None
+_generator = None
+
+_lock = threading.Lock()
+
+
+def get_db() -> Database:
+    global _db
+    if _db is None:
+        with _lock:
+            if _db is None:
+                _db = Database()
+    return _db
+
+
+def get_learner() -> InsightLearner:
+    global _learner
+    if _learner is None:
+        db = get_db()
+        with _lock:
+            if _learner is None:
+                _learner = InsightLearner(db)
+    return _learner
+
+
+def get_retriever() -> "CodeRetriever":
+    global _retriever
+    if _retriever is None:
+        from rag.retriever import CodeRetriever
+        with _lock:
+            if _retriever is None:
+                _retriever = CodeRetriever()
+    return _retriever
+
+
+def get_loader() -> "RepoLoader":
+    global _loader
+    if _loader is None:
+        from rag.loader import RepoLoader
+        with _lock:
+            if _loader is None:
+                _loader = RepoLoader()
+    return _loader
+
+
+def get_generator() -> "PostGenerator":
+    global _generator
+    if _generator is None:
+        from generator.post_generator import PostGenerator
+        with _lock:
+            if _generator is None:
+                _generator = PostGenerator()
+    return _generator
+
@@ -4,29 +4,15 @@ History Tools
 LangChain tools for accessing post history and learned insights.
 """
 
+from operator import attrgetter
 from langchain.tools import tool
 
-from ..memory.database import Database
-from ..memory.learner import InsightLearner
+from agent.utils import repo_short_name, truncate
+from ._singletons import get_db, get_learner
 
 
-# Global instances
-_db = None
-_learner = None
-
-
-def _get_db() -> Database:
-    global _db
-    if _db is None:
-        _db = Database()
-    return _db
-
-
-def _get_learner() -> InsightLearner:
-    global _learner
-    if _learner is None:
-        _learner = InsightLearner()
-    return _learner
+# Engagement fields of a PostWithMetrics row
+_get_engagement = attrgetter("likes", "comments", "shares")
 
 
 @tool
@@ -41,41 +27,41 @@ def get_post_history_tool(chat_id: str, limit: int = 10) -> str:
     Returns:
         List of recent posts with their performance metrics
     """
-    db = _get_db()
+    db = get_db()
 
     posts = db.get_posts_with_metrics(chat_id, limit=limit)
 
     if not posts:
         return "No posts in history yet. Generate and publish some posts first!"
 
-    lines = [f"=== Recent Posts ({len(posts)}) ===\n"]
+    return "\n".join(_render_post_history(posts))
+
+
+def _render_post_history(posts: list):
+    """Yield the lines of the post history report."""
+    yield f"=== Recent Posts ({len(posts)}) ===\n"
 
     for i, post in enumerate(posts, 1):
-        # Format date
-        posted_at = post.get("posted_at", "Not posted")
-        if posted_at and posted_at != "Not posted":
-            posted_at = posted_at[:10]  # Just the date
+        # Format date (just the date part)
+        posted_at = post.posted_at
+        date_str = posted_at[:10] if posted_at else "Not posted"
 
-        # Get metrics
-        likes = post.get("likes", 0) or 0
-        comments = post.get("comments", 0) or 0
-        shares = post.get("shares", 0) or 0
+        # Get metrics (None until metrics are fetched)
+        likes, comments, shares = (v or 0 for v in _get_engagement(post))
 
         # Get trend and repo
-        trend = post.get("trend_matched", "No trend")
-        repo = post.get("repo_url", "")
-        repo_name = repo.rstrip("/").split("/")[-1] if repo else "Unknown"
+        trend = post.trend_matched
+        repo = post.repo_url
+        repo_name = repo_short_name(repo) if repo else "Unknown"
 
         # Truncate content
-        content = post.get("content", "")[:100] + "..." if len(post.get("content", "")) > 100 else post.get("content", "")
-
-        lines.append(f"{i}. Posted: {posted_at}")
-        lines.append(f"   Repo: {repo_name} | Trend: {trend}")
-        lines.append(f"   Engagement: {likes} likes, {comments} comments, {shares} shares")
-        lines.append(f"   Preview: {content}")
-        lines.append("")
+        content = truncate(post.content or "", 100)
 
-    return "\n".join(lines)
+        yield f"{i}. Posted: {date_str}"
+        yield f"   Repo: {repo_name} | Trend: {trend}"
+        yield f"   Engagement: {likes} likes, {comments} comments, {shares} shares"
+        yield f"   Preview: {content}"
+        yield ""
 
 
 @tool
@@ -95,7 +81,7 @@ def get_insights_tool(chat_id: str) -> str:
     Returns:
         Summary of learned content strategy insights
     """
-    learner = _get_learner()
+    learner = get_learner()
 
     # Process any unprocessed posts first
     learner.process_all_pending(chat_id)
@@ -103,18 +89,23 @@ def get_insights_tool(chat_id: str) -> str:
     # Get recommendations
     recommendations = learner.get_content_recommendations(chat_id)
 
-    lines = ["=== Content Strategy Insights ===\n"]
+    return "\n".join(_render_insights(recommendations))
+
+
+def _render_insights(recommendations: dict):
+    """Yield the lines of the insights report."""
+    yield "=== Content Strategy Insights ===\n"
 
     # Summary
-    lines.append(f"Summary: {recommendations['summary']}")
-    lines.append("")
+    yield f"Summary: {recommendations['summary']}"
+    yield ""
 
     # Top topics
     if recommendations["topics"]:
-        lines.append("Best Performing Topics:")
+        yield "Best Performing Topics:"
         for topic in recommendations["topics"]:
-            lines.append(f"  - {topic['topic']} (score: {topic['score']:.1f})")
-        lines.append("")
+            yield f"  - {topic['topic']} (score: {topic['score']:.1f})"
+        yield ""
 
     # Best style
     if recommendations["style"]:
@@ -122,24 +113,22 @@ def get_insights_tool(chat_id: str) -> str:
             "with_code": "Posts WITH code snippets",
             "no_code": "Posts WITHOUT code snippets"
         }.get(recommendations["style"], recommendations["style"])
-        lines.append(f"Best Style: {style_desc}")
+        yield f"Best Style: {style_desc}"
 
     # Best length
     if recommendations["length"]:
-        lines.append(f"Best Length: {recommendations['length'].title()} posts")
+        yield f"Best Length: {recommendations['length'].title()} posts"
 
     # Best repos
     if recommendations["repos"]:
-        lines.append("")
-        lines.append("Best Performing Repos:")
+        yield ""
+        yield "Best Performing Repos:"
         for repo in recommendations["repos"]:
-            lines.append(f"  - {repo['repo']} (score: {repo['score']:.1f})")
+            yield f"  - {repo['repo']} (score: {repo['score']:.1f})"
 
     if not any([recommendations["topics"], recommendations["style"], recommendations["repos"]]):
-        lines.append("Not enough data yet. Post more content to learn patterns!")
-        lines.append("Need at least 3 posts with engagement metrics.")
-
-    return "\n".join(lines)
+        yield "Not enough data yet. Post more content to learn patterns!"
+        yield "Need at least 3 posts with engagement metrics."
 
 
 @tool
@@ -155,7 +144,7 @@ def get_last_post_reasoning_tool(chat_id: str) -> str:
     Returns:
         Explanation of the last post's content strategy
     """
-    db = _get_db()
+    db = get_db()
 
     last_post = db.get_last_post(chat_id)
 
@@ -166,7 +155,7 @@ def get_last_post_reasoning_tool(chat_id: str) -> str:
 
     # Basic info
     repo = last_post.get("repo_url", "")
-    repo_name = repo.rstrip("/").split("/")[-1] if repo else "Unknown"
+    repo_name = repo_short_name(repo) if repo else "Unknown"
     trend = last_post.get("trend_matched", "No specific trend")
 
     lines.append(f"Repository: {repo_name}")
@@ -212,8 +201,8 @@ def suggest_next_post_tool(chat_id: str) -> str:
     Returns:
         Recommendation for next post topic and repo
     """
-    db = _get_db()
-    learner = _get_learner()
+    db = get_db()
+    learner = get_learner()
 
     repos = db.get_repos(chat_id)
     if not repos:
@@ -221,7 +210,7 @@ def suggest_next_post_tool(chat_id: str) -> str:
 
     # Get best repo based on history
     best_repo = learner.get_best_repo_for_today(chat_id, repos)
-    repo_name = best_repo.rstrip("/").split("/")[-1] if best_repo else "Unknown"
+    repo_name = repo_short_name(best_repo) if best_repo else "Unknown"
 
     # Get recommendations
     recommendations = learner.get_content_recommendations(chat_id)
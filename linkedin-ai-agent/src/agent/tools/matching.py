@@ -4,31 +4,122 @@ Matching Tools
 LangChain tools for matching trends to code.
 """
 
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 from langchain.tools import tool
 
-from agent.memory.database import Database
-from rag.retriever import CodeRetriever
-from rag.store import VectorStore
+from agent.utils import repo_short_name, truncate
+from ._singletons import get_db, get_retriever
 from .trends import get_trend_keywords
 
+if TYPE_CHECKING:
+    from rag.retriever import CodeRetriever
 
-# Global instances
-_db = None
-_retriever = None
 
+# Shared pool for the concurrent code searches
+_executor = None
+_executor_lock = threading.Lock()
 
-def _get_db() -> Database:
-    global _db
-    if _db is None:
-        _db = Database()
-    return _db
 
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="match")
+    return _executor
 
-def _get_retriever() -> CodeRetriever:
-    global _retriever
-    if _retriever is None:
-        _retriever = CodeRetriever()
-    return _retriever
+
+VECTOR_STORE_DOWN = "Code search is unavailable right now (vector store not reachable). Try again later."
+
+# Matches shown per repo in match_trends_tool
+MAX_MATCHES_PER_REPO = 3
+
+# Recent search results, shared by the matching tools
+CONTEXT_CACHE_TTL = 60  # seconds
+CONTEXT_CACHE_SIZE = 1024
+
+# (repo_url, keyword, k, store generation) -> (searched_at, context)
+_context_cache: OrderedDict = OrderedDict()
+_context_cache_lock = threading.Lock()
+
+
+def _get_cached_context(key: tuple):
+    """Get a cached search result, or None if missing/expired."""
+    with _context_cache_lock:
+        cached = _context_cache.get(key)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] >= CONTEXT_CACHE_TTL:
+            del _context_cache[key]
+            return None
+        _context_cache.move_to_end(key)
+        return cached[1]
+
+
+def _cache_context(key: tuple, context: list):
+    """Store a search result, evicting the least recently used entry when full."""
+    with _context_cache_lock:
+        _context_cache[key] = (time.monotonic(), context)
+        _context_cache.move_to_end(key)
+        if len(_context_cache) > CONTEXT_CACHE_SIZE:
+            _context_cache.popitem(last=False)
+
+
+def _search_all(retriever: "CodeRetriever", repos: list[str], keywords: list[str], k: int) -> list:
+    """
+    Search every repo for every keyword.
+
+    Recent results are served from the cache. The remaining keywords are
+    embedded once and the vectors reused for each repo; the per-repo
+    searches run concurrently.
+
+    Returns:
+        One list per repo (same order) holding a context list per keyword
+        (None where the search failed)
+    """
+    # Already loaded by the retriever - imported here to keep module import light
+    from rag.store import VectorStore
+
+    # Re-indexing a repo bumps the generation, so stale entries just stop matching
+    generation = VectorStore.generation
+    results = [
+        [_get_cached_context((repo_url, keyword, k, generation)) for keyword in keywords]
+        for repo_url in repos
+    ]
+
+    missing = [
+        keyword for i, keyword in enumerate(keywords)
+        if any(contexts[i] is None for contexts in results)
+    ]
+    if not missing:
+        return results
+
+    try:
+        vectors = dict(zip(missing, retriever.embed_queries(missing)))
+    except Exception:
+        return results
+
+    def search(repo_url, contexts):
+        todo = [kw for kw, context in zip(keywords, contexts) if context is None]
+        if not todo:
+            return contexts
+        try:
+            found = retriever.get_relevant_context_batch(
+                todo, repo_url=repo_url, k=k, query_vectors=[vectors[kw] for kw in todo]
+            )
+        except Exception:
+            return contexts
+
+        found = dict(zip(todo, found))
+        for keyword, context in found.items():
+            _cache_context((repo_url, keyword, k, generation), context)
+        return [found.get(kw, context) for kw, context in zip(keywords, contexts)]
+
+    return list(_get_executor().map(search, repos, results))
 
 
 @tool
@@ -45,8 +136,8 @@ def match_trends_tool(chat_id: str, trend_keyword: str = None) -> str:
     Returns:
         Matching code snippets with their relevance to trends
     """
-    db = _get_db()
-    retriever = _get_retriever()
+    db = get_db()
+    retriever = get_retriever()
 
     repos = db.get_repos(chat_id)
     if not repos:
@@ -61,37 +152,34 @@ def match_trends_tool(chat_id: str, trend_keyword: str = None) -> str:
     if not keywords:
         keywords = ["interesting code", "main functionality", "api endpoints"]
 
+    # Fail fast instead of timing out on every repo
+    if not retriever.ping():
+        return VECTOR_STORE_DOWN
+
     results = []
     matches_found = False
 
-    for repo_url in repos:
-        repo_name = repo_url.rstrip("/").split("/")[-1]
+    # Search every repo for every keyword at once
+    repo_contexts = _search_all(retriever, repos, keywords, k=2)
+
+    for repo_url, contexts in zip(repos, repo_contexts):
+        repo_name = repo_short_name(repo_url)
         repo_matches = []
 
-        for keyword in keywords:
-            try:
-                # Search for code matching this keyword
-                context = retriever.get_relevant_context(
-                    query=keyword,
-                    repo_url=repo_url,
-                    k=2
-                )
-
-                if context:
-                    for item in context:
-                        repo_matches.append({
-                            "keyword": keyword,
-                            "file": item["metadata"].get("file_path", "unknown"),
-                            "snippet": item["content"][:200] + "..." if len(item["content"]) > 200 else item["content"]
-                        })
-                        matches_found = True
-
-            except Exception:
-                continue
+        for keyword, context in zip(keywords, contexts):
+            if len(repo_matches) >= MAX_MATCHES_PER_REPO:
+                break
+            for hit in (context or [])[:MAX_MATCHES_PER_REPO - len(repo_matches)]:
+                repo_matches.append({
+                    "keyword": keyword,
+                    "file": hit.file_path or "unknown",
+                    "snippet": truncate(hit.content, 200)
+                })
+                matches_found = True
 
         if repo_matches:
             results.append(f"\n=== {repo_name} ===")
-            for match in repo_matches[:3]:  # Limit matches per repo
+            for match in repo_matches:
                 results.append(f"\nTrend: '{match['keyword']}'")
                 results.append(f"File: {match['file']}")
                 results.append(f"Snippet: {match['snippet']}")
@@ -115,21 +203,22 @@ def search_code_tool(repo_url: str, query: str, limit: int = 5) -> str:
     Returns:
         Relevant code snippets matching the query
     """
-    retriever = _get_retriever()
+    retriever = get_retriever()
 
     try:
         # Get code context
         context = retriever.get_code_for_post(repo_url=repo_url, focus=query)
 
-        if not context["main_context"]:
+        main_context = context["main_context"]
+        if not main_context:
             return f"No code found matching '{query}' in this repository."
 
         results = [f"=== Search Results for '{query}' ===\n"]
 
         # Add main context
         results.append("Main Match:")
-        results.append(context["main_context"][:500])
-        if len(context["main_context"]) > 500:
+        results.append(main_context[:500])
+        if len(main_context) > 500:
             results.append("... (truncated)")
 
         # Add code snippets
@@ -137,8 +226,9 @@ def search_code_tool(repo_url: str, query: str, limit: int = 5) -> str:
             results.append("\n\nCode Snippets:")
             for snippet in context["code_snippets"][:limit]:
                 results.append(f"\n--- {snippet['file']} (lines {snippet['lines']}) ---")
-                results.append(snippet["code"][:300])
-                if len(snippet["code"]) > 300:
+                code = snippet["code"]
+                results.append(code[:300])
+                if len(code) > 300:
                     results.append("... (truncated)")
 
         # Add files analyzed
@@ -167,8 +257,8 @@ def find_best_content_match(chat_id: str) -> str:
     Returns:
         Best content opportunity with trend, repo, and code snippet
     """
-    db = _get_db()
-    retriever = _get_retriever()
+    db = get_db()
+    retriever = get_retriever()
 
     repos = db.get_repos(chat_id)
     if not repos:
@@ -181,42 +271,44 @@ def find_best_content_match(chat_id: str) -> str:
         # Fallback to generic interesting content
         keywords = ["main functionality", "interesting patterns", "api"]
 
+    # Fail fast instead of timing out on every repo
+    if not retriever.ping():
+        return VECTOR_STORE_DOWN
+
     best_match = None
     best_score = 0
 
-    for repo_url in repos:
-        for keyword in keywords[:5]:
-            try:
-                context = retriever.get_relevant_context(
-                    query=keyword,
-                    repo_url=repo_url,
-                    k=1
-                )
-
-                if context:
-                    # Simple scoring based on content length and keyword match
-                    content = context[0]["content"]
-                    score = len(content)
-
-                    if keyword.lower() in content.lower():
-                        score *= 1.5  # Boost for direct keyword match
-
-                    if score > best_score:
-                        best_score = score
-                        best_match = {
-                            "repo": repo_url,
-                            "trend": keyword,
-                            "file": context[0]["metadata"].get("file_path", "unknown"),
-                            "content": content
-                        }
-
-            except Exception:
+    # Search every repo for every keyword at once (results keep input order)
+    keywords = keywords[:5]
+    lc_keywords = [keyword.lower() for keyword in keywords]
+    repo_contexts = _search_all(retriever, repos, keywords, k=1)
+
+    for repo_url, contexts in zip(repos, repo_contexts):
+        for keyword, lc_keyword, context in zip(keywords, lc_keywords, contexts):
+            if not context:
                 continue
 
+            # Simple scoring based on content length and keyword match
+            hit = context[0]
+            content = hit.content
+            score = len(content)
+
+            if lc_keyword in content.lower():
+                score *= 1.5  # Boost for direct keyword match
+
+            if score > best_score:
+                best_score = score
+                best_match = {
+                    "repo": repo_url,
+                    "trend": keyword,
+                    "file": hit.file_path or "unknown",
+                    "content": content
+                }
+
     if not best_match:
         return "Could not find a good content match. Try adding more repositories or wait for relevant trends."
 
-    repo_name = best_match["repo"].rstrip("/").split("/")[-1]
+    repo_name = repo_short_name(best_match["repo"])
     return f"""=== Best Content Opportunity ===
 
 Trend: {best_match['trend']}
@@ -6,54 +6,8 @@ LangChain tools for generating and publishing LinkedIn posts.
 
 from langchain.tools import tool
 
-from agent.memory.database import Database
-from agent.memory.learner import InsightLearner
-from generator.post_generator import PostGenerator
-from rag.retriever import CodeRetriever
-from rag.loader import RepoLoader
-
-
-# Global instances
-_db = None
-_generator = None
-_retriever = None
-_loader = None
-_learner = None
-
-
-def _get_db() -> Database:
-    global _db
-    if _db is None:
-        _db = Database()
-    return _db
-
-
-def _get_generator() -> PostGenerator:
-    global _generator
-    if _generator is None:
-        _generator = PostGenerator()
-    return _generator
-
-
-def _get_retriever() -> CodeRetriever:
-    global _retriever
-    if _retriever is None:
-        _retriever = CodeRetriever()
-    return _retriever
-
-
-def _get_loader() -> RepoLoader:
-    global _loader
-    if _loader is None:
-        _loader = RepoLoader()
-    return _loader
-
-
-def _get_learner() -> InsightLearner:
-    global _learner
-    if _learner is None:
-        _learner = InsightLearner()
-    return _learner
+from agent.utils import repo_short_name
+from ._singletons import get_db, get_generator, get_learner, get_loader, get_retriever
 
 
 @tool
@@ -75,11 +29,16 @@ def generate_post_tool(
     Returns:
         Generated LinkedIn post content
     """
-    db = _get_db()
-    generator = _get_generator()
-    retriever = _get_retriever()
-    loader = _get_loader()
-    learner = _get_learner()
+    return _generate_post(chat_id, repo_url, trend, style)
+
+
+def _generate_post(chat_id: str, repo_url: str, trend: str = None, style: str = "adaptive") -> str:
+    """Generate and save a post (plain function so other tools skip tool invocation)."""
+    db = get_db()
+    generator = get_generator()
+    retriever = get_retriever()
+    loader = get_loader()
+    learner = get_learner()
 
     try:
         # Get learned recommendations
@@ -117,11 +76,11 @@ def generate_post_tool(
         )
 
         # Build reasoning
-        reasoning = f"Selected repo: {repo_url}\n"
+        reasoning = [f"Selected repo: {repo_url}"]
         if trend:
-            reasoning += f"Matched to trend: {trend}\n"
-        reasoning += f"Style: {style}\n"
-        reasoning += f"Files analyzed: {', '.join(code_context['files_analyzed'][:3])}"
+            reasoning.append(f"Matched to trend: {trend}")
+        reasoning.append(f"Style: {style}")
+        reasoning.append(f"Files analyzed: {', '.join(code_context['files_analyzed'][:3])}")
 
         # Save to database
         post_id = db.create_post(
@@ -129,7 +88,7 @@ def generate_post_tool(
             content=post_content,
             repo_url=repo_url,
             trend_matched=trend,
-            reasoning=reasoning
+            reasoning="\n".join(reasoning)
         )
 
         return f"""=== Generated LinkedIn Post ===
@@ -138,7 +97,7 @@ def generate_post_tool(
 
 ---
 Post ID: {post_id}
-Repository: {repo_url.split('/')[-1]}
+Repository: {repo_short_name(repo_url)}
 Trend: {trend or 'None'}
 Style: {style}
 
@@ -165,8 +124,8 @@ def generate_post_with_insights_tool(chat_id: str) -> str:
     Returns:
         Generated LinkedIn post with explanation of choices
     """
-    db = _get_db()
-    learner = _get_learner()
+    db = get_db()
+    learner = get_learner()
 
     repos = db.get_repos(chat_id)
     if not repos:
@@ -187,17 +146,13 @@ def generate_post_with_insights_tool(chat_id: str) -> str:
     style = recommendations["length"] if recommendations["length"] else "adaptive"
 
     # Generate the post
-    result = generate_post_tool.invoke({
-        "chat_id": chat_id,
-        "repo_url": best_repo,
-        "trend": trend,
-        "style": style
-    })
-
-    # Add insight explanation
+    result = _generate_post(chat_id, best_repo, trend, style)
+
+    # Add insight explanation below the post
     explanation = [
+        result,
         "\n--- Why these choices? ---",
-        f"Repo: {best_repo.split('/')[-1]} (best historical performance + avoiding repetition)"
+        f"Repo: {repo_short_name(best_repo)} (best historical performance + avoiding repetition)"
     ]
 
     if trend:
@@ -210,7 +165,7 @@ def generate_post_with_insights_tool(chat_id: str) -> str:
     if recommendations["summary"]:
         explanation.append(f"Note: {recommendations['summary']}")
 
-    return result + "\n" + "\n".join(explanation)
+    return "\n".join(explanation)
 
 
 def save_post_as_published(post_id: str, linkedin_post_id: str):
@@ -221,5 +176,5 @@ def save_post_as_published(post_id: str, linkedin_post_id: str):
         post_id: The internal post ID
         linkedin_post_id: The LinkedIn post ID
     """
-    db = _get_db()
+    db = get_db()
     db.mark_post_published(post_id, linkedin_post_id)
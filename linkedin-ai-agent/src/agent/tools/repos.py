@@ -5,39 +5,22 @@ LangChain tools for managing and analyzing GitHub repositories.
 """
 
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from langchain.tools import tool
 
-from agent.memory.database import Database
-from rag.loader import RepoLoader
-from rag.store import VectorStore
+from agent.utils import repo_short_name
+from ._singletons import get_db, get_loader
 
 
-# Global instances (initialized lazily)
-_db = None
-_loader = None
-_store = None
+# How long a repo analysis is reused before re-scanning (seconds)
+ANALYSIS_TTL = 300
 
-
-def _get_db() -> Database:
-    global _db
-    if _db is None:
-        _db = Database()
-    return _db
-
-
-def _get_loader() -> RepoLoader:
-    global _loader
-    if _loader is None:
-        _loader = RepoLoader()
-    return _loader
-
-
-def _get_store() -> VectorStore:
-    global _store
-    if _store is None:
-        _store = VectorStore()
-    return _store
+# repo_url -> (analyzed_at, analysis)
+_analysis_cache: dict[str, tuple[float, dict]] = {}
+_analysis_cache_lock = threading.Lock()
 
 
 @tool
@@ -51,7 +34,7 @@ def list_repos_tool(chat_id: str) -> str:
     Returns:
         List of connected repositories with their status
     """
-    db = _get_db()
+    db = get_db()
     repos = db.get_repos(chat_id)
 
     if not repos:
@@ -59,12 +42,83 @@ def list_repos_tool(chat_id: str) -> str:
 
     lines = [f"Connected repositories ({len(repos)}/5):"]
     for i, repo_url in enumerate(repos, 1):
-        repo_name = repo_url.rstrip("/").split("/")[-1]
+        repo_name = repo_short_name(repo_url)
         lines.append(f"{i}. {repo_name} - {repo_url}")
 
     return "\n".join(lines)
 
 
+def _analyze_repo_core(repo_url: str) -> dict:
+    """
+    Score a repository's content potential (cached for ANALYSIS_TTL).
+
+    Returns:
+        Dict with 'score', 'reasons', 'commits' and 'files'
+
+    Raises:
+        Exception: If the repo can't be cloned/pulled or read
+    """
+    with _analysis_cache_lock:
+        cached = _analysis_cache.get(repo_url)
+    if cached and time.monotonic() - cached[0] < ANALYSIS_TTL:
+        return cached[1]
+
+    loader = get_loader()
+
+    # Load/update the repo
+    loader.clone_or_pull(repo_url)
+
+    # Get recent commits
+    commits = loader.get_recent_commits(repo_url, days=7)
+
+    # Get repo stats
+    stats = loader.get_repo_stats(repo_url)
+
+    # Calculate content potential score
+    score = 0
+    reasons = []
+
+    # Recent activity is valuable
+    if commits:
+        score += min(len(commits) * 10, 40)
+        reasons.append(f"{len(commits)} commits this week")
+    else:
+        reasons.append("No recent commits")
+
+    # Large repos have more content potential
+    file_count = stats.get("file_count", 0)
+    if file_count > 50:
+        score += 20
+        reasons.append(f"{file_count} files to explore")
+    elif file_count > 10:
+        score += 10
+        reasons.append(f"{file_count} files")
+
+    # Check for interesting files
+    has_readme = stats.get("has_readme", False)
+    has_tests = stats.get("has_tests", False)
+
+    if has_readme:
+        score += 10
+        reasons.append("Has README")
+    if has_tests:
+        score += 10
+        reasons.append("Has tests")
+
+    # Get sample of interesting code
+    sample_files = loader.get_interesting_files(repo_url, limit=3)
+
+    analysis = {
+        "score": score,
+        "reasons": reasons,
+        "commits": commits,
+        "files": sample_files
+    }
+    with _analysis_cache_lock:
+        _analysis_cache[repo_url] = (time.monotonic(), analysis)
+    return analysis
+
+
 @tool
 def analyze_repo_tool(repo_url: str) -> str:
     """
@@ -82,79 +136,43 @@ def analyze_repo_tool(repo_url: str) -> str:
     Returns:
         Analysis report with content potential score
     """
-    loader = _get_loader()
-
     try:
-        # Load/update the repo
-        repo_path = loader.clone_or_pull(repo_url)
-
-        # Get recent commits
-        commits = loader.get_recent_commits(repo_url, days=7)
-
-        # Get repo stats
-        stats = loader.get_repo_stats(repo_url)
-
-        # Calculate content potential score
-        score = 0
-        reasons = []
-
-        # Recent activity is valuable
-        if commits:
-            score += min(len(commits) * 10, 40)
-            reasons.append(f"{len(commits)} commits this week")
-        else:
-            reasons.append("No recent commits")
-
-        # Large repos have more content potential
-        file_count = stats.get("file_count", 0)
-        if file_count > 50:
-            score += 20
-            reasons.append(f"{file_count} files to explore")
-        elif file_count > 10:
-            score += 10
-            reasons.append(f"{file_count} files")
-
-        # Check for interesting files
-        has_readme = stats.get("has_readme", False)
-        has_tests = stats.get("has_tests", False)
-
-        if has_readme:
-            score += 10
-            reasons.append("Has README")
-        if has_tests:
-            score += 10
-            reasons.append("Has tests")
-
-        # Get sample of interesting code
-        sample_files = loader.get_interesting_files(repo_url, limit=3)
-
-        # Build report
-        report = [
-            f"=== Repository Analysis: {repo_url.split('/')[-1]} ===",
-            f"Content Potential Score: {score}/100",
-            "",
-            "Factors:",
-        ]
-        for reason in reasons:
-            report.append(f"  - {reason}")
-
-        if commits:
-            report.append("")
-            report.append("Recent Commits:")
-            for commit in commits[:3]:
-                report.append(f"  - {commit['message'][:60]}...")
-
-        if sample_files:
-            report.append("")
-            report.append("Interesting Files:")
-            for f in sample_files:
-                report.append(f"  - {f}")
-
-        return "\n".join(report)
-
+        analysis = _analyze_repo_core(repo_url)
     except Exception as e:
         return f"Error analyzing repo: {str(e)}"
 
+    return "\n".join(_render_analysis(repo_url, analysis))
+
+
+def _render_analysis(repo_url: str, analysis: dict):
+    """Yield the lines of a repo analysis report."""
+    yield f"=== Repository Analysis: {repo_short_name(repo_url)} ==="
+    yield f"Content Potential Score: {analysis['score']}/100"
+    yield ""
+    yield "Factors:"
+    for reason in analysis["reasons"]:
+        yield f"  - {reason}"
+
+    if analysis["commits"]:
+        yield ""
+        yield "Recent Commits:"
+        for commit in analysis["commits"][:3]:
+            yield f"  - {commit['message'][:60]}..."
+
+    if analysis["files"]:
+        yield ""
+        yield "Interesting Files:"
+        for f in analysis["files"]:
+            yield f"  - {f}"
+
+
+def _score_repo(repo_url: str) -> int:
+    """Content potential score for a repo (0 if it can't be analyzed)."""
+    try:
+        return _analyze_repo_core(repo_url)["score"]
+    except Exception:
+        return 0
+
 
 @tool
 def compare_repos_tool(chat_id: str) -> str:
@@ -169,7 +187,7 @@ def compare_repos_tool(chat_id: str) -> str:
     Returns:
         Ranked list of repos with recommendations
     """
-    db = _get_db()
+    db = get_db()
     repos = db.get_repos(chat_id)
 
     if not repos:
@@ -178,27 +196,17 @@ def compare_repos_tool(chat_id: str) -> str:
     if len(repos) == 1:
         return f"Only one repo connected: {repos[0]}\nThis will be used for content generation."
 
-    # Analyze each repo
+    # Analyze each repo (independent git/disk work, so run them in parallel)
+    with ThreadPoolExecutor(max_workers=len(repos)) as executor:
+        scores = list(executor.map(_score_repo, repos))
+
     analyses = []
-    for repo_url in repos:
-        analysis = analyze_repo_tool.invoke({"repo_url": repo_url})
-
-        # Extract score from analysis
-        score = 0
-        for line in analysis.split("\n"):
-            if "Score:" in line:
-                try:
-                    score = int(line.split(":")[1].split("/")[0].strip())
-                except:
-                    pass
-                break
-
-        repo_name = repo_url.rstrip("/").split("/")[-1]
+    for repo_url, score in zip(repos, scores):
+        repo_name = repo_short_name(repo_url)
         analyses.append({
             "name": repo_name,
             "url": repo_url,
-            "score": score,
-            "analysis": analysis
+            "score": score
         })
 
     # Sort by score
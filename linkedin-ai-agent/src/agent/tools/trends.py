@@ -4,11 +4,83 @@ Trend Tools
 LangChain tools for fetching trending developer topics.
 """
 
+import threading
+import time
+from itertools import chain
 from langchain.tools import tool
-from typing import List, Literal
+from typing import TYPE_CHECKING, List, Literal
 
-from trends.hackernews import HackerNewsTrends
-from trends.twitter import TwitterTrends
+from agent.utils import truncate
+
+# Trend clients (and tweepy) are imported on first use
+if TYPE_CHECKING:
+    from trends.hackernews import HackerNewsTrends, Trend
+    from trends.twitter import TwitterTrends
+
+
+# How long fetched trends stay fresh, per source (seconds)
+TREND_TTLS = {
+    "hackernews": 600,  # Front page moves slowly
+    "twitter": 300,
+}
+
+# Empty results (usually a failed/rate-limited fetch) are retried sooner
+NEGATIVE_TREND_TTL = 30
+
+# Lazy-loaded clients
+_hn = None
+_twitter = None
+
+# (source, limit) -> (fetched_at, trends)
+_trend_cache: dict[tuple, tuple[float, list["Trend"]]] = {}
+_trend_cache_lock = threading.Lock()
+
+
+def get_hn() -> "HackerNewsTrends":
+    global _hn
+    if _hn is None:
+        from trends.hackernews import HackerNewsTrends
+        _hn = HackerNewsTrends()
+    return _hn
+
+
+def get_twitter() -> "TwitterTrends":
+    global _twitter
+    if _twitter is None:
+        from trends.twitter import TwitterTrends
+        _twitter = TwitterTrends()
+    return _twitter
+
+
+def get_cached_trends(source: str, limit: int) -> list["Trend"]:
+    """
+    Get trends for a source, refetching only once its TTL has expired.
+
+    Shared process-wide, so the agent's tools and the /trends command
+    hit the same cache.
+
+    Args:
+        source: "hackernews" or "twitter"
+        limit: Maximum number of trends
+
+    Returns:
+        List of Trend objects
+    """
+    key = (source, limit)
+    with _trend_cache_lock:
+        cached = _trend_cache.get(key)
+    if cached:
+        fetched_at, trends = cached
+        ttl = TREND_TTLS[source] if trends else NEGATIVE_TREND_TTL
+        if time.monotonic() - fetched_at < ttl:
+            return trends
+
+    client = get_hn() if source == "hackernews" else get_twitter()
+    trends = client.get_trending(limit=limit)
+
+    with _trend_cache_lock:
+        _trend_cache[key] = (time.monotonic(), trends)
+    return trends
 
 
 @tool
@@ -23,11 +95,15 @@ def fetch_trends_tool(source: Literal["hackernews", "twitter", "all"] = "hackern
     Returns:
         Formatted string of current trends with titles, scores, and keywords
     """
+    return _format_trends(source, limit)
+
+
+def _format_trends(source: str, limit: int) -> str:
+    """Build the trends report (plain function so other tools skip tool invocation)."""
     results = []
 
     if source in ("hackernews", "all"):
-        hn = HackerNewsTrends()
-        trends = hn.get_trending(limit=limit)
+        trends = get_cached_trends("hackernews", limit)
         if trends:
             results.append("=== HackerNews Trends ===")
             for i, trend in enumerate(trends, 1):
@@ -36,14 +112,13 @@ def fetch_trends_tool(source: Literal["hackernews", "twitter", "all"] = "hackern
                 results.append(f"   Score: {trend.score} | Keywords: {keywords}")
 
     if source in ("twitter", "all"):
-        tw = TwitterTrends()
-        if tw.is_available():
-            trends = tw.get_trending(limit=limit)
+        if get_twitter().is_available():
+            trends = get_cached_trends("twitter", limit)
             if trends:
                 results.append("\n=== Twitter Trends ===")
                 for i, trend in enumerate(trends, 1):
                     keywords = ", ".join(trend.keywords[:3]) if trend.keywords else "general"
-                    title = trend.title[:100] + "..." if len(trend.title) > 100 else trend.title
+                    title = truncate(trend.title, 100)
                     results.append(f"{i}. {title}")
                     results.append(f"   Engagement: {trend.score} | Keywords: {keywords}")
         else:
@@ -65,7 +140,7 @@ def get_all_trends_tool() -> str:
     Returns:
         Comprehensive list of current developer trends
     """
-    return fetch_trends_tool.invoke({"source": "all", "limit": 10})
+    return _format_trends("all", 10)
 
 
 def get_trend_keywords() -> List[str]:
@@ -76,17 +151,8 @@ def get_trend_keywords() -> List[str]:
     Returns:
         List of keyword strings
     """
-    keywords = set()
-
-    # HackerNews (always available)
-    hn = HackerNewsTrends()
-    for trend in hn.get_trending(limit=15):
-        keywords.update(trend.keywords)
-
-    # Twitter (if available)
-    tw = TwitterTrends()
-    if tw.is_available():
-        for trend in tw.get_trending(limit=10):
-            keywords.update(trend.keywords)
+    # HackerNews (always available), Twitter (if available)
+    hn_trends = get_cached_trends("hackernews", 15)
+    tw_trends = get_cached_trends("twitter", 10) if get_twitter().is_available() else []
 
-    return list(keywords)
+    return list(set(chain.from_iterable(t.keywords for t in chain(hn_trends, tw_trends))))
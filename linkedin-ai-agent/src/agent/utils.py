@@ -0,0 +1,24 @@
+"""
+Agent Utilities
+
+Small helpers shared by the agent tools and memory.
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=512)
+def repo_short_name(repo_url: str) -> str:
+    """Extract the repo name from a GitHub URL (e.g. ".../user/repo/" -> "repo")."""
+    return repo_url.rstrip("/").rpartition("/")[2]
+
+
+@lru_cache(maxsize=512)
+def repo_full_name(repo_url: str) -> str:
+    """Extract "owner/repo" from a GitHub URL (e.g. ".../user/repo/" -> "user/repo")."""
+    return "/".join(repo_url.rstrip("/").rsplit("/", 2)[-2:])
+
+
+def truncate(text: str, limit: int) -> str:
+    """Cut text to `limit` characters, marking the cut with "..."."""
+    return text if len(text) <= limit else text[:limit] + "..."
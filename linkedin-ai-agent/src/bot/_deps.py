@@ -0,0 +1,161 @@
+"""
+Shared Bot Dependencies
+
+Sets up the import path once and holds the process-wide instances every
+command module uses, so the bot has one config store, one agent database
+and one RAG stack. RAG/LLM components are built on first use so commands
+like /auth and /connect never pay for the embedding libraries.
+"""
+
+import asyncio
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+# Add src to path for imports
+_SRC_DIR = str(Path(__file__).parent.parent)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+from .config import get_config_store
+
+if TYPE_CHECKING:
+    from agent.memory.database import Database
+    from agent.memory.learner import InsightLearner
+    from agent.strategist import ContentStrategist
+    from generator.post_generator import PostGenerator
+    from rag.loader import RepoLoader
+    from rag.retriever import CodeRetriever
+    from rag.store import VectorStore
+
+
+config_store = get_config_store()
+
+# Global instances (initialized lazily)
+_db = None
+_learner = None
+_repo_loader = None
+_vector_store = None
+_retriever = None
+_post_generator = None
+_strategist = None
+
+_lock = threading.Lock()
+
+# Per-chat locks keep one chat's handlers in order; the semaphore caps
+# outbound API calls across every chat
+MAX_CHAT_LOCKS = 1024
+MAX_OUTBOUND_CALLS = 20
+_chat_locks: OrderedDict[int, asyncio.Lock] = OrderedDict()
+_outbound = None
+
+
+def get_db() -> "Database":
+    global _db
+    if _db is None:
+        from agent.memory.database import Database
+        with _lock:
+            if _db is None:
+                _db = Database()
+    return _db
+
+
+def get_learner() -> "InsightLearner":
+    global _learner
+    if _learner is None:
+        from agent.memory.learner import InsightLearner
+        db = get_db()
+        with _lock:
+            if _learner is None:
+                _learner = InsightLearner(db)
+    return _learner
+
+
+def get_repo_loader() -> "RepoLoader":
+    global _repo_loader
+    if _repo_loader is None:
+        from rag.loader import RepoLoader
+        with _lock:
+            if _repo_loader is None:
+                _repo_loader = RepoLoader()
+    return _repo_loader
+
+
+def get_vector_store() -> "VectorStore":
+    global _vector_store
+    if _vector_store is None:
+        from rag.store import VectorStore
+        with _lock:
+            if _vector_store is None:
+                _vector_store = VectorStore()
+    return _vector_store
+
+
+def get_retriever() -> "CodeRetriever":
+    global _retriever
+    if _retriever is None:
+        from rag.retriever import CodeRetriever
+        vector_store = get_vector_store()
+        with _lock:
+            if _retriever is None:
+                _retriever = CodeRetriever(vector_store)
+    return _retriever
+
+
+def get_post_generator() -> "PostGenerator":
+    global _post_generator
+    if _post_generator is None:
+        from generator.post_generator import PostGenerator
+        with _lock:
+            if _post_generator is None:
+                _post_generator = PostGenerator()
+    return _post_generator
+
+
+def get_strategist() -> "ContentStrategist":
+    global _strategist
+    if _strategist is None:
+        from agent.strategist import ContentStrategist
+        with _lock:
+            if _strategist is None:
+                # Keeps its LLM, tools and per-chat executors between runs
+                _strategist = ContentStrategist(verbose=False)
+    return _strategist
+
+
+def get_chat_lock(chat_id: int) -> asyncio.Lock:
+    """
+    Get the lock serializing handlers for one chat.
+
+    Args:
+        chat_id: Telegram chat ID
+
+    Returns:
+        asyncio.Lock for this chat
+    """
+    lock = _chat_locks.get(chat_id)
+    if lock is not None:
+        _chat_locks.move_to_end(chat_id)
+        return lock
+
+    lock = _chat_locks[chat_id] = asyncio.Lock()
+
+    # Forget the least recently used chats, skipping any still in a handler
+    if len(_chat_locks) > MAX_CHAT_LOCKS:
+        for old_id in list(_chat_locks)[:-1]:
+            if not _chat_locks[old_id].locked():
+                del _chat_locks[old_id]
+            if len(_chat_locks) <= MAX_CHAT_LOCKS:
+                break
+    return lock
+
+
+def get_outbound() -> asyncio.Semaphore:
+    """Get the semaphore bounding concurrent outbound API calls."""
+    global _outbound
+    if _outbound is None:
+        # Created on first use so it belongs to the running event loop
+        _outbound = asyncio.Semaphore(MAX_OUTBOUND_CALLS)
+    return _outbound
@@ -4,24 +4,30 @@ Post Approval Handler
 Handles approval flow and LinkedIn posting.
 """
 
-import sys
-from pathlib import Path
+import asyncio
 
 from telegram import Update
 from telegram.ext import ContextTypes
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
+from ._deps import (
+    config_store,
+    get_chat_lock,
+    get_outbound,
+    get_repo_loader,
+    get_vector_store,
+    get_retriever,
+    get_post_generator,
+)
 from .config import ConfigStore
+from .status import send
+from .pending import get_pending, pop_pending, set_pending
+from .post_cache import post_cache_key, get_cached_post, cache_post, forget_post
 from linkedin.poster import linkedin_poster
 
-
-# Initialize config store
-config_store = ConfigStore()
+_POSTED_TPL = "*Posted to LinkedIn!*\n\n{link}Use `/generate` to create another post."
 
 # Approval keywords
-APPROVAL_KEYWORDS = {"post", "yes", "go", "ship", "publish", "send"}
+APPROVAL_KEYWORDS = frozenset(("post", "yes", "go", "ship", "publish", "send"))
 
 
 def is_approval_message(text: str) -> bool:
@@ -32,20 +38,21 @@ def is_approval_message(text: str) -> bool:
         text: Message text
 
     Returns:
-        True if this is an approval
+        True if any word of the message is an approval keyword
     """
     text = text.strip().lower()
 
-    # Exact match
+    # Most approvals are a bare keyword - one hash lookup, no splitting
     if text in APPROVAL_KEYWORDS:
         return True
 
-    # Partial match in short messages
-    for keyword in APPROVAL_KEYWORDS:
-        if keyword in text and len(text) < 50:
-            return True
+    # Only short messages count - a long message that mentions "post" isn't an approval
+    tokens = text.split()
+    if not tokens or len(text) >= 50:
+        return False
 
-    return False
+    # Whole-word match, ignoring trailing punctuation ("ship it!")
+    return not APPROVAL_KEYWORDS.isdisjoint(token.strip(".,!?") for token in tokens)
 
 
 async def handle_approval(update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
@@ -59,35 +66,41 @@ async def handle_approval(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     Returns:
         True if approval was handled
     """
+    # One approval at a time per chat, so a double "yes" can't post twice
+    async with get_chat_lock(update.effective_chat.id):
+        return await _handle_approval(update, context)
+
+
+async def _handle_approval(update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
+    """Publish the pending post. Caller holds the chat lock."""
     chat_id = update.effective_chat.id
 
     # Check for pending post
-    pending_post = context.user_data.get("pending_post")
+    pending = await get_pending(chat_id)
 
-    if not pending_post:
-        await update.message.reply_text(
+    if not pending:
+        send(update.message.reply_text(
             "No pending post to approve.\n\n"
             "Use `/generate` to create a new post first.",
             parse_mode="Markdown"
-        )
+        ))
         return True
 
     # Get user config
-    config = config_store.get(chat_id)
+    config = await config_store.aget(chat_id)
 
     # Check if LinkedIn is connected
     if not config.is_linkedin_connected():
         # Clear pending post
-        context.user_data.pop("pending_post", None)
-        context.user_data.pop("pending_repo", None)
+        await pop_pending(chat_id)
 
-        await update.message.reply_text(
+        send(update.message.reply_text(
             "*Post approved!*\n\n"
             "However, LinkedIn is not connected.\n"
             "Use `/auth` to connect LinkedIn, then your posts will be published automatically.\n\n"
             "For now, you can copy the post and share it manually.",
             parse_mode="Markdown"
-        )
+        ))
         return True
 
     # Publish to LinkedIn
@@ -96,25 +109,24 @@ async def handle_approval(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     )
 
     try:
-        result = linkedin_poster.create_post(
-            access_token=config.linkedin_token,
-            text=pending_post
-        )
+        # Run the HTTP call off the event loop so other chats keep moving
+        async with get_outbound():
+            result = await asyncio.to_thread(
+                linkedin_poster.create_post,
+                access_token=config.linkedin_token,
+                text=pending.text
+            )
 
         # Clear pending post
-        context.user_data.pop("pending_post", None)
-        context.user_data.pop("pending_repo", None)
+        await pop_pending(chat_id)
 
         if result.success:
-            success_msg = "*Posted to LinkedIn!*\n\n"
+            forget_post(pending.text)
 
-            if result.post_url:
-                success_msg += f"View your post: {result.post_url}\n\n"
-
-            success_msg += "Use `/generate` to create another post."
+            link = f"View your post: {result.post_url}\n\n" if result.post_url else ""
 
             await status_msg.edit_text(
-                success_msg,
+                _POSTED_TPL.format(link=link),
                 parse_mode="Markdown",
                 disable_web_page_preview=True
             )
@@ -150,25 +162,24 @@ async def generate_scheduled_post(
         bot: Telegram bot instance
         config_store: Config store instance
     """
-    from rag.loader import RepoLoader
-    from rag.store import VectorStore
-    from rag.retriever import CodeRetriever
-    from generator.post_generator import PostGenerator
-
-    config = config_store.get(chat_id)
+    config = await config_store.aget(chat_id)
 
     if not config.github_url:
         return
 
     try:
-        # Initialize components
-        repo_loader = RepoLoader()
-        vector_store = VectorStore()
-        retriever = CodeRetriever(vector_store)
-        post_generator = PostGenerator()
-
-        # Load collection
-        if not vector_store.load_collection(config.github_url):
+        # Shared components - the first scheduled run builds them off the event loop
+        retriever, post_generator = await asyncio.gather(
+            asyncio.to_thread(get_retriever),
+            asyncio.to_thread(get_post_generator)
+        )
+        repo_loader = get_repo_loader()
+        vector_store = get_vector_store()
+
+        # Only checks the collection - retrieval below resolves this repo's own
+        # collection handle, so concurrent runs for other users can't swap it
+        indexed = await asyncio.to_thread(vector_store.indexed_repos, [config.github_url])
+        if config.github_url not in indexed:
             # Repository not indexed, skip
             await bot.send_message(
                 chat_id=chat_id,
@@ -178,11 +189,12 @@ async def generate_scheduled_post(
             )
             return
 
-        # Get git diff
-        git_diff = repo_loader.get_git_diff(config.github_url)
-
-        # Get code context
-        code_context = retriever.get_code_for_post(config.github_url)
+        # Get git diff, code context and HEAD concurrently
+        git_diff, code_context, head_sha = await asyncio.gather(
+            asyncio.to_thread(repo_loader.get_git_diff, config.github_url),
+            asyncio.to_thread(retriever.get_code_for_post, config.github_url),
+            asyncio.to_thread(repo_loader.get_head_sha, config.github_url)
+        )
 
         if not code_context["main_context"]:
             await bot.send_message(
@@ -193,14 +205,24 @@ async def generate_scheduled_post(
             )
             return
 
-        # Generate post
-        post = post_generator.generate_post(
-            repo_url=config.github_url,
-            code_context=code_context["main_context"],
-            code_snippets=code_context["code_snippets"],
-            git_diff=git_diff,
-            post_style="adaptive"
+        # Generate post (a no-op day reuses the cached draft)
+        cache_key = post_cache_key(
+            config.github_url,
+            head_sha,
+            code_context["main_context"]
         )
+        post = get_cached_post(cache_key)
+        if post is None:
+            # In a thread so users sharing a time slot generate concurrently
+            post = await asyncio.to_thread(
+                post_generator.generate_post,
+                repo_url=config.github_url,
+                code_context=code_context["main_context"],
+                code_snippets=code_context["code_snippets"],
+                git_diff=git_diff,
+                post_style="adaptive"
+            )
+            cache_post(cache_key, post)
 
         # Send the draft
         header = (
@@ -214,9 +236,8 @@ async def generate_scheduled_post(
             "Or `/generate` for a new version."
         )
 
-        # Note: For scheduled posts, we can't use context.user_data
-        # In a production system, you'd store pending posts in a database
-        # For MVP, scheduled posts go directly to the user for manual action
+        # Register the draft so replying "post" publishes it
+        await set_pending(chat_id, post, config.github_url)
 
         await bot.send_message(
             chat_id=chat_id,
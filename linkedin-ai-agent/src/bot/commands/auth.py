@@ -4,21 +4,18 @@
 Handles LinkedIn OAuth authentication flow.
 """
 
-import sys
-from pathlib import Path
+import asyncio
 
 from telegram import Update
 from telegram.ext import ContextTypes
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
-from ..config import ConfigStore
+from .._deps import config_store, get_outbound
+from ..status import send
 from linkedin.oauth import linkedin_oauth
 
 
-# Initialize config store
-config_store = ConfigStore()
+# Tokens this close to expiry are re-verified with LinkedIn on /authstatus
+TOKEN_RECHECK_WINDOW = 5 * 60
 
 
 async def auth_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -28,35 +25,35 @@ async def auth_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     Initiates LinkedIn OAuth flow.
     """
     chat_id = update.effective_chat.id
-    config = config_store.get(chat_id)
+    config = await config_store.aget(chat_id)
 
     # Check if already connected
     if config.is_linkedin_connected():
-        await update.message.reply_text(
+        send(update.message.reply_text(
             "*LinkedIn is already connected!*\n\n"
             "Use `/authstatus` to check your connection.\n"
             "Use `/deauth` to disconnect and re-authenticate.",
             parse_mode="Markdown"
-        )
+        ))
         return
 
     # Check if OAuth is configured
     if not linkedin_oauth.is_configured():
-        await update.message.reply_text(
+        send(update.message.reply_text(
             "*LinkedIn OAuth not configured.*\n\n"
             "The bot administrator needs to set up:\n"
             "• `LINKEDIN_CLIENT_ID`\n"
             "• `LINKEDIN_CLIENT_SECRET`\n\n"
             "See the README for setup instructions.",
             parse_mode="Markdown"
-        )
+        ))
         return
 
     try:
         # Generate auth URL
         auth_url = linkedin_oauth.generate_auth_url(chat_id)
 
-        await update.message.reply_text(
+        send(update.message.reply_text(
             "*Connect your LinkedIn account:*\n\n"
             f"1. Click this link to authorize:\n{auth_url}\n\n"
             "2. After authorizing, you'll be redirected to a callback page.\n"
@@ -65,13 +62,13 @@ async def auth_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             "_The link expires in 10 minutes._",
             parse_mode="Markdown",
             disable_web_page_preview=True
-        )
+        ))
 
     except Exception as e:
-        await update.message.reply_text(
+        send(update.message.reply_text(
             f"Error starting OAuth flow:\n`{str(e)}`",
             parse_mode="Markdown"
-        )
+        ))
 
 
 async def authcode_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -84,11 +81,11 @@ async def authcode_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 
     # Check if code was provided
     if not context.args or len(context.args) == 0:
-        await update.message.reply_text(
+        send(update.message.reply_text(
             "Please provide the authorization code.\n\n"
             "Usage: `/authcode YOUR_CODE`",
             parse_mode="Markdown"
-        )
+        ))
         return
 
     code = context.args[0].strip()
@@ -98,18 +95,20 @@ async def authcode_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     )
 
     try:
-        # Exchange code for tokens
-        tokens = linkedin_oauth.exchange_code(code)
+        # Exchange code for tokens (blocking HTTP, so off the event loop)
+        async with get_outbound():
+            tokens = await asyncio.to_thread(linkedin_oauth.exchange_code, code)
 
-        # Get user profile to verify
-        profile = linkedin_oauth.get_user_profile(tokens.access_token)
+            # Get user profile to verify
+            profile = await asyncio.to_thread(linkedin_oauth.get_user_profile, tokens.access_token)
         name = profile.get("name", "Unknown")
 
         # Save to config
-        config_store.update(
+        await config_store.aupdate(
             chat_id=chat_id,
             linkedin_token=tokens.access_token,
-            linkedin_token_expiry=tokens.expires_at.isoformat()
+            linkedin_token_expiry=tokens.expires_at.isoformat(),
+            linkedin_name=name
         )
 
         await status_msg.edit_text(
@@ -135,34 +134,39 @@ async def authstatus_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     Shows LinkedIn connection status.
     """
     chat_id = update.effective_chat.id
-    config = config_store.get(chat_id)
+    config = await config_store.aget(chat_id)
 
     if config.is_linkedin_connected():
         try:
-            # Verify token is still valid
-            profile = linkedin_oauth.get_user_profile(config.linkedin_token)
-            name = profile.get("name", "Unknown")
-
-            await update.message.reply_text(
+            # Trust the stored expiry unless it's close; only then ask LinkedIn
+            if config.linkedin_name and config.linkedin_token_valid_for(TOKEN_RECHECK_WINDOW):
+                name = config.linkedin_name
+            else:
+                async with get_outbound():
+                    profile = await asyncio.to_thread(linkedin_oauth.get_user_profile, config.linkedin_token)
+                name = profile.get("name", "Unknown")
+                await config_store.aupdate(chat_id=chat_id, linkedin_name=name)
+
+            send(update.message.reply_text(
                 f"*LinkedIn Status: Connected*\n\n"
                 f"Account: {name}\n"
                 f"Token expires: {config.linkedin_token_expiry}\n\n"
                 "Use `/deauth` to disconnect.",
                 parse_mode="Markdown"
-            )
+            ))
         except:
-            await update.message.reply_text(
+            send(update.message.reply_text(
                 "*LinkedIn Status: Token Expired*\n\n"
                 "Your LinkedIn token has expired.\n"
                 "Use `/auth` to reconnect.",
                 parse_mode="Markdown"
-            )
+            ))
     else:
-        await update.message.reply_text(
+        send(update.message.reply_text(
             "*LinkedIn Status: Not Connected*\n\n"
             "Use `/auth` to connect your LinkedIn account.",
             parse_mode="Markdown"
-        )
+        ))
 
 
 async def deauth_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -172,25 +176,26 @@ async def deauth_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     Disconnects LinkedIn account.
     """
     chat_id = update.effective_chat.id
-    config = config_store.get(chat_id)
+    config = await config_store.aget(chat_id)
 
     if not config.linkedin_token:
-        await update.message.reply_text(
+        send(update.message.reply_text(
             "LinkedIn is not connected.\n\n"
             "Use `/auth` to connect.",
             parse_mode="Markdown"
-        )
+        ))
         return
 
     # Clear LinkedIn tokens
-    config_store.update(
+    await config_store.aupdate(
         chat_id=chat_id,
         linkedin_token=None,
-        linkedin_token_expiry=None
+        linkedin_token_expiry=None,
+        linkedin_name=None
     )
 
-    await update.message.reply_text(
+    send(update.message.reply_text(
         "*LinkedIn disconnected.*\n\n"
         "Use `/auth` to connect again.",
         parse_mode="Markdown"
-    )
+    ))
@@ -5,37 +5,52 @@ Generates a LinkedIn post from the connected repository.
 Supports both legacy mode (single repo) and agent mode (multi-repo with trends).
 """
 
+import asyncio
 import os
-import sys
-from pathlib import Path
+import re
+import time
 
 from telegram import Update
 from telegram.ext import ContextTypes
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from .._deps import (
+    config_store,
+    get_chat_lock,
+    get_db,
+    get_repo_loader,
+    get_vector_store,
+    get_retriever,
+    get_post_generator,
+    get_strategist,
+)
+from ..status import StatusUpdater, send
+from ..pending import get_pending, set_pending
+from ..post_cache import post_cache_key, get_cached_post, cache_post, forget_repo
+from agent.utils import repo_short_name
 
-from ..config import ConfigStore
-from rag.loader import RepoLoader
-from rag.chunker import CodeChunker
-from rag.store import VectorStore
-from rag.retriever import CodeRetriever
-from generator.post_generator import PostGenerator
-from agent.memory.database import Database
-from agent.strategist import ContentStrategist
 
+# Runs of text between the "===" banners in agent output
+_SECTION_RE = re.compile(r'(?:^|===)((?:(?!===).)*)', re.DOTALL)
 
-# Initialize components
-config_store = ConfigStore()
-repo_loader = RepoLoader()
-vector_store = VectorStore()
-retriever = CodeRetriever(vector_store)
-post_generator = PostGenerator()
-agent_db = Database()
+# Agent database is cheap; the RAG/LLM stack is built on first /generate
+agent_db = get_db()
 
 # Check if agent mode is enabled
 AGENT_MODE = os.getenv("AGENT_MODE", "true").lower() == "true"
 
+# Background indexing - a fixed pool of workers drains the job queue. One
+# worker: indexing shares the vector store and the chunking process pool,
+# and jobs queue up behind each other instead of competing for them
+INDEX_WORKERS = 1
+_index_queue: asyncio.Queue = None
+_index_workers: list[asyncio.Task] = []
+_indexing: set[str] = set()  # repo URLs queued or in progress
+
+# repo URL -> (indexed?, expiry). Kept current by the index workers; the TTL
+# catches collections deleted behind the bot's back
+INDEXED_TTL = 300
+_indexed_cache: dict[str, tuple[bool, float]] = {}
+
 
 async def generate_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
@@ -44,20 +59,27 @@ async def generate_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     Generates a LinkedIn post from the connected repository.
     Uses agent mode if multiple repos are connected or AGENT_MODE is enabled.
     """
+    # Runs for the same chat are serialized so drafts don't overwrite each other
+    async with get_chat_lock(update.effective_chat.id):
+        await _generate_command(update, context)
+
+
+async def _generate_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Generate a draft. Caller holds the chat lock."""
     chat_id = str(update.effective_chat.id)
-    config = config_store.get(int(chat_id))
+    config = await config_store.aget(int(chat_id))
 
     # Check for repos in new agent database
     agent_repos = agent_db.get_repos(chat_id)
 
     # Check if repo is connected (either legacy or new mode)
     if not config.github_url and not agent_repos:
-        await update.message.reply_text(
+        send(update.message.reply_text(
             "No repository connected.\n\n"
             "Use `/addrepo https://github.com/user/repo` to add one.\n"
             "You can connect up to 5 repositories.",
             parse_mode="Markdown"
-        )
+        ))
         return
 
     # Use agent mode if multiple repos or explicitly enabled
@@ -75,52 +97,62 @@ async def generate_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         "Generating your LinkedIn post...\n\n"
         "This may take a moment."
     )
+    status = StatusUpdater(status_msg)
 
     try:
-        # Check if repo is indexed
-        if not vector_store.load_collection(config.github_url):
-            await status_msg.edit_text(
-                "Indexing your repository for the first time...\n\n"
-                "This may take a few minutes."
+        # Index in the background rather than holding up the handler
+        if not await _is_indexed(config.github_url):
+            enqueue_indexing(context.bot, int(chat_id), config.github_url)
+            await status.flush(
+                "Indexing your repository for the first time.\n\n"
+                "I'll message you when it's done - then run `/generate` again.",
+                parse_mode="Markdown"
             )
+            return
 
-            # Index the repository
-            await index_repository(config.github_url)
-
-        # Get git diff for recent changes
-        await status_msg.edit_text(
-            "Checking for recent changes..."
-        )
-        git_diff = repo_loader.get_git_diff(config.github_url)
-
-        # Retrieve relevant code context
-        await status_msg.edit_text(
-            "Finding interesting code to write about..."
+        # Recent changes, code context and HEAD are independent - fetch them at once
+        status.set("Finding recent changes and interesting code...")
+        repo_loader = get_repo_loader()
+        retriever = await asyncio.to_thread(get_retriever)
+        git_diff, code_context, head_sha = await asyncio.gather(
+            asyncio.to_thread(repo_loader.get_git_diff, config.github_url),
+            asyncio.to_thread(retriever.get_code_for_post, config.github_url),
+            asyncio.to_thread(repo_loader.get_head_sha, config.github_url)
         )
-        code_context = retriever.get_code_for_post(config.github_url)
 
         if not code_context["main_context"]:
-            await status_msg.edit_text(
+            await status.flush(
                 "Couldn't find interesting code in the repository.\n\n"
                 "Try `/refresh` to re-index the repository."
             )
             return
 
         # Generate the post
-        await status_msg.edit_text(
-            "Writing your LinkedIn post..."
-        )
-
-        post = post_generator.generate_post(
-            repo_url=config.github_url,
-            code_context=code_context["main_context"],
-            code_snippets=code_context["code_snippets"],
-            git_diff=git_diff,
-            post_style="adaptive"
+        status.set("Writing your LinkedIn post...")
+
+        # Same commit and same context -> reuse the last draft, unless it's
+        # the one the user is already looking at (they asked for a new version)
+        cache_key = post_cache_key(
+            config.github_url,
+            head_sha,
+            code_context["main_context"]
         )
+        post = get_cached_post(cache_key)
+        pending = await get_pending(int(chat_id))
+        if post is None or (pending is not None and post == pending.text):
+            post_generator = await asyncio.to_thread(get_post_generator)
+            post = await asyncio.to_thread(
+                post_generator.generate_post,
+                repo_url=config.github_url,
+                code_context=code_context["main_context"],
+                code_snippets=code_context["code_snippets"],
+                git_diff=git_diff,
+                post_style="adaptive"
+            )
+            cache_post(cache_key, post)
 
         # Send the generated post
-        await status_msg.delete()
+        await status.delete()
 
         # Split into header and post content
         header = (
@@ -135,8 +167,7 @@ async def generate_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         )
 
         # Store the draft for approval
-        context.user_data["pending_post"] = post
-        context.user_data["pending_repo"] = config.github_url
+        await set_pending(int(chat_id), post, config.github_url)
 
         await update.message.reply_text(
             header + post + footer,
@@ -144,7 +175,7 @@ async def generate_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         )
 
     except Exception as e:
-        await status_msg.edit_text(
+        await status.flush(
             f"Error generating post:\n`{str(e)}`\n\n"
             "Please try again or check your configuration with `/status`.",
             parse_mode="Markdown"
@@ -172,22 +203,25 @@ async def generate_with_agent(
         "Checking trends and insights...",
         parse_mode="Markdown"
     )
+    status = StatusUpdater(status_msg)
 
     try:
-        # Initialize agent
-        agent = ContentStrategist(verbose=False)
-
-        # Ensure all repos are indexed
-        for repo_url in repos:
-            if not vector_store.load_collection(repo_url):
-                await status_msg.edit_text(
-                    f"Indexing repository: `{repo_url.split('/')[-1]}`...",
-                    parse_mode="Markdown"
-                )
-                await index_repository(repo_url)
+        # Queue any unindexed repos and come back once they're ready
+        unindexed = await _find_unindexed(repos)
+        if unindexed:
+            for repo_url in unindexed:
+                enqueue_indexing(context.bot, int(chat_id), repo_url)
+            names = ", ".join(f"`{repo_short_name(r)}`" for r in unindexed)
+            await status.flush(
+                f"Indexing started for {names}.\n\n"
+                "I'll message you when done. Then run `/generate` again.",
+                parse_mode="Markdown"
+            )
+            return
 
         # Update status
-        await status_msg.edit_text(
+        # The agent run is long, so make sure this one is on screen
+        await status.flush(
             "🤖 *Agent thinking...*\n\n"
             "• Fetching trends\n"
             "• Comparing repos\n"
@@ -196,11 +230,12 @@ async def generate_with_agent(
             parse_mode="Markdown"
         )
 
-        # Run the agent
-        result = agent.generate_daily_post(chat_id)
+        # Run the agent (built once, on the first agent-mode /generate)
+        agent = await asyncio.to_thread(get_strategist)
+        result = await asyncio.to_thread(agent.generate_daily_post, chat_id)
 
         if not result["success"]:
-            await status_msg.edit_text(
+            await status.flush(
                 f"❌ Agent error:\n`{result['output']}`",
                 parse_mode="Markdown"
             )
@@ -210,34 +245,19 @@ async def generate_with_agent(
         output = result["output"]
 
         # Parse the generated post
-        post_content = output
-        if "===" in output:
-            # Extract just the post content
-            parts = output.split("===")
-            for part in parts:
-                if part.strip() and "Reply with" not in part and "Post ID" not in part:
-                    post_content = part.strip()
-                    break
-
-        # Clean up the content
-        if "Generated LinkedIn Post" in post_content:
-            post_content = post_content.replace("Generated LinkedIn Post", "").strip()
-
-        await status_msg.delete()
-
-        # Build reasoning summary
-        reasoning_lines = []
-        if result["reasoning"]:
-            for step in result["reasoning"][:3]:  # Show first 3 steps
-                reasoning_lines.append(f"• {step['tool']}")
-
-        reasoning_text = ""
-        if reasoning_lines:
-            reasoning_text = "\n\n*Agent steps:*\n" + "\n".join(reasoning_lines)
+        post_content = _extract_post_content(output)
+
+        await status.delete()
+
+        # Build reasoning summary from the first 3 steps
+        steps = result["reasoning"][:3]
+        reasoning_text = (
+            "\n\n*Agent steps:*\n" + "\n".join(f"• {step['tool']}" for step in steps)
+            if steps else ""
+        )
 
         # Store the draft
-        context.user_data["pending_post"] = post_content
-        context.user_data["pending_repo"] = repos[0] if repos else ""
+        await set_pending(int(chat_id), post_content, repos[0] if repos else "")
 
         # Send the post
         header = (
@@ -259,22 +279,107 @@ async def generate_with_agent(
         )
 
     except Exception as e:
-        await status_msg.edit_text(
+        await status.flush(
             f"❌ Error generating post:\n`{str(e)}`\n\n"
             "Try `/generate` again or check `/status`.",
             parse_mode="Markdown"
         )
 
 
-async def index_repository(github_url: str) -> None:
+def _extract_post_content(output: str) -> str:
     """
-    Index a repository for RAG retrieval.
+    Pull the post out of the agent's output.
+
+    The publisher tool wraps the post in "===" banners next to sections
+    like the post ID and reply instructions; the post is the first
+    section that isn't one of those.
+
+    Args:
+        output: Final agent output
+
+    Returns:
+        The post text (the whole output if no section qualifies)
+    """
+    post_content = output
+    for match in _SECTION_RE.finditer(output):
+        section = match.group(1)
+        if section.strip() and "Reply with" not in section and "Post ID" not in section:
+            post_content = section.strip()
+            break
+
+    # Clean up the content
+    if "Generated LinkedIn Post" in post_content:
+        post_content = post_content.replace("Generated LinkedIn Post", "").strip()
+    return post_content
+
+
+async def _is_indexed(github_url: str) -> bool:
+    """
+    Check whether a repo has a vector collection, caching the answer.
 
     Args:
         github_url: GitHub repository URL
+
+    Returns:
+        True if the repo's collection exists and has documents
+    """
+    return not await _find_unindexed([github_url])
+
+
+async def _find_unindexed(repos: list[str]) -> list[str]:
     """
+    Find the repos that still need indexing, caching the answers.
+
+    Repos without a fresh cached answer are checked together with a
+    single collection listing.
+
+    Args:
+        repos: GitHub repository URLs
+
+    Returns:
+        The repos (in order) whose collections are missing or empty
+    """
+    now = time.monotonic()
+    indexed = {}
+    unknown = []
+    for repo_url in repos:
+        cached = _indexed_cache.get(repo_url)
+        if cached and cached[1] > now:
+            indexed[repo_url] = cached[0]
+        else:
+            unknown.append(repo_url)
+
+    if unknown:
+        found = await asyncio.to_thread(get_vector_store().indexed_repos, unknown)
+        expires = time.monotonic() + INDEXED_TTL
+        for repo_url in unknown:
+            indexed[repo_url] = repo_url in found
+            _indexed_cache[repo_url] = (indexed[repo_url], expires)
+
+    return [r for r in repos if not indexed[r]]
+
+
+def _index_repository_sync(github_url: str, force_refresh: bool = False) -> tuple[int, int]:
+    """
+    Clone, chunk and embed a repository. Blocking - run it in a thread.
+
+    Chunks the collection already holds aren't embedded again, so a refresh
+    costs roughly what changed rather than the whole repo.
+
+    Args:
+        github_url: GitHub repository URL
+        force_refresh: Re-clone before syncing the collection
+
+    Returns:
+        (file count, chunk count)
+    """
+    from rag.chunker import CodeChunker
+
+    repo_loader = get_repo_loader()
+    vector_store = get_vector_store()
+
     # Load repository
-    repo_path = repo_loader.load(github_url, force_refresh=False)
+    repo_path = repo_loader.load(github_url, force_refresh=force_refresh)
 
     # Get file list
     files = repo_loader.get_file_list(github_url)
@@ -284,11 +389,91 @@ async def index_repository(github_url: str) -> None:
 
     # Chunk files
     chunker = CodeChunker()
-    chunks = chunker.chunk_files(files, repo_path)
-    documents = chunker.create_chunk_documents(chunks)
+    chunks = chunker.chunk_files_parallel(files, repo_path)
+
+    # Embed new/changed chunks a batch at a time, drop vanished ones
+    total, _, _ = vector_store.sync_document_batches(
+        chunker.iter_document_batches(chunks), github_url
+    )
+
+    return len(files), total
+
+
+async def index_repository(github_url: str, force_refresh: bool = False) -> tuple[int, int]:
+    """
+    Index a repository for RAG retrieval without blocking the event loop.
+
+    Args:
+        github_url: GitHub repository URL
+        force_refresh: Re-clone before syncing the collection
+
+    Returns:
+        (file count, chunk count)
+    """
+    return await asyncio.to_thread(_index_repository_sync, github_url, force_refresh)
+
+
+def enqueue_indexing(bot, chat_id: int, github_url: str, force_refresh: bool = False) -> bool:
+    """
+    Queue a repository for background indexing.
+
+    The user is messaged from the worker once indexing finishes.
+
+    Args:
+        bot: Telegram bot used for the completion message
+        chat_id: Chat to notify
+        github_url: GitHub repository URL
+        force_refresh: Re-clone and rebuild the index
+
+    Returns:
+        False if the repo is already queued or being indexed
+    """
+    global _index_queue
+
+    if github_url in _indexing:
+        return False
+
+    if _index_queue is None:
+        _index_queue = asyncio.Queue()
+    if not _index_workers:
+        _index_workers.extend(
+            asyncio.create_task(_indexer_worker()) for _ in range(INDEX_WORKERS)
+        )
+
+    _indexing.add(github_url)
+    if force_refresh:
+        # Drafts were built on the old index
+        forget_repo(github_url)
+    _index_queue.put_nowait((bot, chat_id, github_url, force_refresh))
+    return True
+
+
+async def _indexer_worker() -> None:
+    """Pull indexing jobs off the queue and report back to the user."""
+    while True:
+        bot, chat_id, github_url, force_refresh = await _index_queue.get()
+        try:
+            try:
+                files, chunks = await index_repository(github_url, force_refresh)
+            except Exception as e:
+                text = f"Error indexing repository:\n`{github_url}`\n`{str(e)}`"
+            else:
+                _indexed_cache[github_url] = (True, time.monotonic() + INDEXED_TTL)
+                text = (
+                    f"Repository indexed:\n`{github_url}`\n\n"
+                    f"Found {files} code files.\n"
+                    f"Created {chunks} searchable chunks.\n\n"
+                    "Use `/generate` to create a post."
+                )
 
-    # Store embeddings
-    vector_store.add_documents(documents, github_url)
+            # A failed send only gets logged - it says nothing about the indexing
+            try:
+                await bot.send_message(chat_id=chat_id, text=text, parse_mode="Markdown")
+            except Exception as send_error:
+                print(f"Failed to report indexing result: {send_error}")
+        finally:
+            _indexing.discard(github_url)
+            _index_queue.task_done()
 
 
 async def refresh_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -298,52 +483,25 @@ async def refresh_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     Re-indexes the connected repository.
     """
     chat_id = update.effective_chat.id
-    config = config_store.get(chat_id)
+    config = await config_store.aget(chat_id)
 
     if not config.github_url:
-        await update.message.reply_text(
+        send(update.message.reply_text(
             "No repository connected.\n\n"
             "Use `/connect https://github.com/user/repo` first.",
             parse_mode="Markdown"
-        )
+        ))
         return
 
-    status_msg = await update.message.reply_text(
+    if not enqueue_indexing(context.bot, chat_id, config.github_url, force_refresh=True):
+        send(update.message.reply_text(
+            "This repository is already being indexed.\n\n"
+            "I'll message you when it's done."
+        ))
+        return
+
+    send(update.message.reply_text(
         f"Re-indexing repository:\n`{config.github_url}`\n\n"
-        "This may take a few minutes...",
+        "Indexing started, I'll message you when done.",
         parse_mode="Markdown"
-    )
-
-    try:
-        # Delete existing collection
-        vector_store.delete_collection(config.github_url)
-
-        # Force refresh and re-index
-        repo_path = repo_loader.load(config.github_url, force_refresh=True)
-        files = repo_loader.get_file_list(config.github_url)
-
-        if not files:
-            await status_msg.edit_text(
-                "No code files found in repository.\n\n"
-                "Make sure the repository contains code files."
-            )
-            return
-
-        chunker = CodeChunker()
-        chunks = chunker.chunk_files(files, repo_path)
-        documents = chunker.create_chunk_documents(chunks)
-        vector_store.add_documents(documents, config.github_url)
-
-        await status_msg.edit_text(
-            f"Repository re-indexed successfully!\n\n"
-            f"Found {len(files)} code files.\n"
-            f"Created {len(documents)} searchable chunks.\n\n"
-            "Use `/generate` to create a new post.",
-            parse_mode="Markdown"
-        )
-
-    except Exception as e:
-        await status_msg.edit_text(
-            f"Error refreshing repository:\n`{str(e)}`",
-            parse_mode="Markdown"
-        )
+    ))
@@ -4,20 +4,33 @@ Insights Commands
 Commands for viewing agent insights and explaining decisions.
 """
 
+import asyncio
+
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from agent.memory.database import Database
-from agent.memory.learner import InsightLearner
-from trends.hackernews import HackerNewsTrends
-from trends.twitter import TwitterTrends
+from .._deps import get_db, get_learner
+from agent.utils import repo_short_name, truncate
 from scheduler.metrics_fetcher import get_manual_input
 
 
-# Initialize components
-db = Database()
-learner = InsightLearner(db)
-manual_input = get_manual_input()
+# Shared database (the learner and trend sources are loaded on first use)
+db = get_db()
+
+# Score bars for 0-100 scores, one block per 20 points
+_SCORE_BARS = tuple("█" * n + "░" * (5 - n) for n in range(6))
+
+_NOT_ENOUGH_DATA = (
+    "*Not enough data yet.*\n\n"
+    "Generate and post more content to learn patterns.\n"
+    "Need at least 3 posts with engagement metrics.\n\n"
+    "_Tip: Use `/generate` to create a post!_"
+)
+
+
+def _score_bar(score: float) -> str:
+    """Render a 0-100 score as a five-block bar."""
+    return _SCORE_BARS[min(5, max(0, int(score // 20)))]
 
 
 async def insights_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -27,6 +40,7 @@ async def insights_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     Shows learned patterns about what content performs best.
     """
     chat_id = str(update.effective_chat.id)
+    learner = get_learner()
 
     # Process any unprocessed posts
     learner.process_all_pending(chat_id)
@@ -43,9 +57,10 @@ async def insights_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     # Top topics
     if recommendations["topics"]:
         lines.append("*Best Performing Topics:*")
-        for topic in recommendations["topics"][:5]:
-            score_bar = "█" * int(topic["score"] / 20) + "░" * (5 - int(topic["score"] / 20))
-            lines.append(f"• {topic['topic']} [{score_bar}]")
+        lines.extend(
+            f"• {topic['topic']} [{_score_bar(topic['score'])}]"
+            for topic in recommendations["topics"][:5]
+        )
         lines.append("")
 
     # Best style
@@ -63,17 +78,14 @@ async def insights_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     # Best repos
     if recommendations["repos"]:
         lines.append("\n*Best Performing Repos:*")
-        for repo in recommendations["repos"][:3]:
-            lines.append(f"• {repo['repo']} (score: {repo['score']:.0f})")
+        lines.extend(
+            f"• {repo['repo']} (score: {repo['score']:.0f})"
+            for repo in recommendations["repos"][:3]
+        )
 
     # Not enough data
-    if not any([recommendations["topics"], recommendations["style"], recommendations["repos"]]):
-        lines.append("*Not enough data yet.*")
-        lines.append("")
-        lines.append("Generate and post more content to learn patterns.")
-        lines.append("Need at least 3 posts with engagement metrics.")
-        lines.append("")
-        lines.append("_Tip: Use `/generate` to create a post!_")
+    if not (recommendations["topics"] or recommendations["style"] or recommendations["repos"]):
+        lines.append(_NOT_ENOUGH_DATA)
 
     await update.message.reply_text(
         "\n".join(lines),
@@ -92,29 +104,35 @@ async def trends_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     )
 
     try:
+        # Shares the agent's trend cache (and its lazily built clients)
+        from agent.tools.trends import get_cached_trends, get_twitter
+
         lines = ["*Current Developer Trends*\n"]
 
-        # HackerNews trends (always available)
-        hn = HackerNewsTrends()
-        hn_trends = hn.get_trending(limit=7)
+        # HackerNews is always available, Twitter only when configured -
+        # fetch whichever apply at the same time
+        fetches = [asyncio.to_thread(get_cached_trends, "hackernews", 7)]
+        twitter_available = get_twitter().is_available()
+        if twitter_available:
+            fetches.append(asyncio.to_thread(get_cached_trends, "twitter", 5))
+        hn_trends, *tw_results = await asyncio.gather(*fetches)
 
         if hn_trends:
             lines.append("*HackerNews:*")
             for i, trend in enumerate(hn_trends, 1):
                 keywords = ", ".join(trend.keywords[:2]) if trend.keywords else ""
                 keywords_str = f" ({keywords})" if keywords else ""
-                title = trend.title[:50] + "..." if len(trend.title) > 50 else trend.title
+                title = truncate(trend.title, 50)
                 lines.append(f"{i}. {title}{keywords_str}")
             lines.append("")
 
         # Twitter trends (if available)
-        tw = TwitterTrends()
-        if tw.is_available():
-            tw_trends = tw.get_trending(limit=5)
+        if twitter_available:
+            tw_trends = tw_results[0]
             if tw_trends:
                 lines.append("*Twitter:*")
                 for i, trend in enumerate(tw_trends, 1):
-                    title = trend.title[:40] + "..." if len(trend.title) > 40 else trend.title
+                    title = truncate(trend.title, 40)
                     lines.append(f"{i}. {title}")
                 lines.append("")
         else:
@@ -156,7 +174,7 @@ async def why_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
 
     # Basic info
     repo = last_post.get("repo_url", "")
-    repo_name = repo.rstrip("/").split("/")[-1] if repo else "Unknown"
+    repo_name = repo_short_name(repo) if repo else "Unknown"
     trend = last_post.get("trend_matched", "None")
     created = last_post.get("created_at", "")[:19] if last_post.get("created_at") else "Unknown"
 
@@ -183,7 +201,7 @@ async def why_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     # Preview
     content = last_post.get("content", "")
     if content:
-        preview = content[:150] + "..." if len(content) > 150 else content
+        preview = truncate(content, 150)
         lines.append("")
         lines.append("*Preview:*")
         lines.append(f"_{preview}_")
@@ -219,6 +237,7 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
     # Parse the stats
     args_text = " ".join(context.args)
+    manual_input = get_manual_input()
     metrics, error = manual_input.parse_stats_command(args_text)
 
     if error:
@@ -8,17 +8,25 @@ import re
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from agent.memory.database import Database
+from .._deps import get_db
+from agent.utils import repo_full_name, repo_short_name
 
 
-# Initialize database
-db = Database()
+# Shared database
+db = get_db()
+
+_GITHUB_URL_RE = re.compile(r'^https?://github\.com/[\w-]+/[\w.-]+/?$')
+_GITHUB_PREFIXES = ("https://github.com/", "http://github.com/")
+MAX_URL_LENGTH = 256
 
 
 def is_valid_github_url(url: str) -> bool:
     """Check if a URL is a valid GitHub repository URL."""
-    pattern = r'^https?://github\.com/[\w-]+/[\w.-]+/?$'
-    return bool(re.match(pattern, url))
+    return (
+        len(url) <= MAX_URL_LENGTH
+        and url.startswith(_GITHUB_PREFIXES)
+        and _GITHUB_URL_RE.match(url) is not None
+    )
 
 
 async def repos_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -42,9 +50,7 @@ async def repos_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     lines = [f"*Connected Repositories ({len(repos)}/5):*\n"]
 
     for i, repo_url in enumerate(repos, 1):
-        repo_name = repo_url.rstrip("/").split("/")[-1]
-        owner = repo_url.rstrip("/").split("/")[-2]
-        lines.append(f"{i}. `{owner}/{repo_name}`")
+        lines.append(f"{i}. `{repo_full_name(repo_url)}`")
         lines.append(f"   {repo_url}")
 
     lines.append("\n*Commands:*")
@@ -93,7 +99,7 @@ async def addrepo_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     success, message = db.add_repo(chat_id, repo_url)
 
     if success:
-        repo_name = repo_url.split("/")[-1]
+        repo_name = repo_short_name(repo_url)
         repos = db.get_repos(chat_id)
         await update.message.reply_text(
             f"*Repository added:* `{repo_name}`\n\n"
@@ -139,7 +145,7 @@ async def removerepo_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     success, message = db.remove_repo(chat_id, repo_url)
 
     if success:
-        repo_name = repo_url.split("/")[-1]
+        repo_name = repo_short_name(repo_url)
         await update.message.reply_text(
             f"*Repository removed:* `{repo_name}`\n\n"
             "Use `/repos` to see your connected repositories.",
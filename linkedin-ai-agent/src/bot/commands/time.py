@@ -5,46 +5,23 @@ Sets the preferred daily posting time and timezone.
 """
 
 import re
+import time
+from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Tuple
 from zoneinfo import ZoneInfo, available_timezones
 
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from ..config import ConfigStore
-
-
-# Initialize config store
-config_store = ConfigStore()
+from .._deps import config_store
 
 # Common timezone aliases for easier input
 TIMEZONE_ALIASES = {
-    # UTC offsets
+    # Whole-hour UTC offsets are resolved in resolve_timezone
     "utc": "UTC",
-    "utc+0": "UTC",
-    "utc+1": "Africa/Lagos",
-    "utc+2": "Africa/Cairo",
-    "utc+3": "Africa/Nairobi",
-    "utc+4": "Asia/Dubai",
-    "utc+5": "Asia/Karachi",
+    # Half-hour offsets have no Etc/GMT zone
     "utc+5:30": "Asia/Kolkata",
-    "utc+6": "Asia/Dhaka",
-    "utc+7": "Asia/Bangkok",
-    "utc+8": "Asia/Singapore",
-    "utc+9": "Asia/Tokyo",
-    "utc+10": "Australia/Sydney",
-    "utc+11": "Pacific/Noumea",
-    "utc+12": "Pacific/Auckland",
-    "utc-1": "Atlantic/Azores",
-    "utc-2": "Atlantic/South_Georgia",
-    "utc-3": "America/Sao_Paulo",
-    "utc-4": "America/New_York",
-    "utc-5": "America/Chicago",
-    "utc-6": "America/Denver",
-    "utc-7": "America/Los_Angeles",
-    "utc-8": "America/Anchorage",
-    "utc-9": "America/Adak",
-    "utc-10": "Pacific/Honolulu",
     # Common city names
     "lagos": "Africa/Lagos",
     "london": "Europe/London",
@@ -66,6 +43,57 @@ TIMEZONE_ALIASES = {
     "seattle": "America/Los_Angeles",
 }
 
+# Whole-hour offsets like "utc+1" or "utc-05:00"
+_UTC_OFFSET_RE = re.compile(r'^utc([+-])(\d{1,2})(?::00)?$')
+
+# 24-hour hour -> (12-hour hour, AM/PM)
+_HOUR_DISPLAY = tuple(
+    (12 if h == 0 else (h if h <= 12 else h - 12), "AM" if h < 12 else "PM")
+    for h in range(24)
+)
+
+# Fixed replies, built once at import
+_TIME_USAGE_TPL = (
+    "*Current posting time:* `{current_time}`\n\n"
+    "To change it, use:\n"
+    "`/time HH:MM`\n\n"
+    "Examples:\n"
+    "• `/time 09:00` - 9 AM\n"
+    "• `/time 14:30` - 2:30 PM\n"
+    "• `/time 18:00` - 6 PM"
+)
+
+_INVALID_TIME = (
+    "Invalid time format.\n\n"
+    "Please use `HH:MM` format (24-hour).\n\n"
+    "Examples:\n"
+    "• `09:00` - 9 AM\n"
+    "• `14:30` - 2:30 PM\n"
+    "• `18:00` - 6 PM"
+)
+
+_TIMEZONE_USAGE_TPL = (
+    "*Current timezone:* `{display}`\n\n"
+    "*To change it, use:*\n"
+    "`/timezone <timezone>`\n\n"
+    "*Examples:*\n"
+    "• `/timezone Lagos`\n"
+    "• `/timezone UTC+1`\n"
+    "• `/timezone America/New_York`\n"
+    "• `/timezone Europe/London`\n"
+    "• `/timezone Asia/Tokyo`\n\n"
+    "_Your scheduled posts will trigger at your local time._"
+)
+
+_UNKNOWN_TIMEZONE_TPL = (
+    "Could not find timezone: `{tz_input}`\n\n"
+    "*Try one of these formats:*\n"
+    "• City name: `Lagos`, `London`, `Tokyo`\n"
+    "• UTC offset: `UTC+1`, `UTC-5`\n"
+    "• Full name: `Africa/Lagos`, `America/New_York`\n\n"
+    "_Tip: Search for your city name or use UTC offset._"
+)
+
 
 def parse_time(time_str: str) -> Optional[Tuple[int, int]]:
     """
@@ -74,21 +102,17 @@ def parse_time(time_str: str) -> Optional[Tuple[int, int]]:
     Returns:
         Tuple of (hour, minute) or None if invalid
     """
-    # Try HH:MM format
-    match = re.match(r'^(\d{1,2}):(\d{2})$', time_str.strip())
-    if match:
-        hour, minute = int(match.group(1)), int(match.group(2))
-        if 0 <= hour <= 23 and 0 <= minute <= 59:
-            return (hour, minute)
+    # HH:MM or H:MM - fixed enough to check by position, no regex needed
+    time_str = time_str.strip()
+    if len(time_str) not in (4, 5) or time_str[-3] != ":":
+        return None
 
-    # Try H:MM format
-    match = re.match(r'^(\d):(\d{2})$', time_str.strip())
-    if match:
-        hour, minute = int(match.group(1)), int(match.group(2))
-        if 0 <= hour <= 9 and 0 <= minute <= 59:
-            return (hour, minute)
+    hour_str, minute_str = time_str[:-3], time_str[-2:]
+    if not (hour_str.isascii() and hour_str.isdigit() and minute_str.isascii() and minute_str.isdigit()):
+        return None
 
-    return None
+    hour, minute = int(hour_str), int(minute_str)
+    return (hour, minute) if hour <= 23 and minute <= 59 else None
 
 
 def format_time(hour: int, minute: int) -> str:
@@ -107,17 +131,11 @@ async def time_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
     # Check if time was provided
     if not context.args or len(context.args) == 0:
-        config = config_store.get(chat_id)
+        config = await config_store.aget(chat_id)
         current_time = config.preferred_time or "Not set"
 
         await update.message.reply_text(
-            f"*Current posting time:* `{current_time}`\n\n"
-            "To change it, use:\n"
-            "`/time HH:MM`\n\n"
-            "Examples:\n"
-            "• `/time 09:00` - 9 AM\n"
-            "• `/time 14:30` - 2:30 PM\n"
-            "• `/time 18:00` - 6 PM",
+            _TIME_USAGE_TPL.format(current_time=current_time),
             parse_mode="Markdown"
         )
         return
@@ -126,15 +144,7 @@ async def time_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     parsed = parse_time(time_str)
 
     if not parsed:
-        await update.message.reply_text(
-            "Invalid time format.\n\n"
-            "Please use `HH:MM` format (24-hour).\n\n"
-            "Examples:\n"
-            "• `09:00` - 9 AM\n"
-            "• `14:30` - 2:30 PM\n"
-            "• `18:00` - 6 PM",
-            parse_mode="Markdown"
-        )
+        await update.message.reply_text(_INVALID_TIME, parse_mode="Markdown")
         return
 
     hour, minute = parsed
@@ -145,24 +155,17 @@ async def time_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     user = update.effective_user
 
     # Save to config
-    config_store.update(
+    await config_store.aupdate(
         chat_id=chat_id,
         preferred_time=formatted_time
     )
 
-    # Determine AM/PM for friendly message
-    if hour < 12:
-        period = "AM"
-        display_hour = hour if hour > 0 else 12
-    elif hour == 12:
-        period = "PM"
-        display_hour = 12
-    else:
-        period = "PM"
-        display_hour = hour - 12
+    # 12-hour form for the friendly message, e.g. "2:30 PM"
+    display_hour, period = _HOUR_DISPLAY[hour]
+    friendly = f"{display_hour}:{minute:02d} {period}"
 
     await update.message.reply_text(
-        f"Daily posting time set to `{formatted_time}` ({display_hour}:{minute:02d} {period})\n\n"
+        f"Daily posting time set to `{formatted_time}` ({friendly})\n\n"
         "I'll send you a draft post at this time each day.\n"
         "You can approve it by replying with `post`, `yes`, `go`, or `ship`.",
         parse_mode="Markdown"
@@ -176,7 +179,7 @@ async def clear_time_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     Removes the scheduled posting time (disables daily posts).
     """
     chat_id = update.effective_chat.id
-    config = config_store.get(chat_id)
+    config = await config_store.aget(chat_id)
 
     if not config.preferred_time:
         await update.message.reply_text(
@@ -187,7 +190,7 @@ async def clear_time_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
 
     old_time = config.preferred_time
-    config_store.update(chat_id=chat_id, preferred_time=None)
+    await config_store.aupdate(chat_id=chat_id, preferred_time=None)
 
     await update.message.reply_text(
         f"Cleared posting time (was `{old_time}`).\n\n"
@@ -213,27 +216,51 @@ def resolve_timezone(tz_input: str) -> Optional[str]:
     if tz_input in TIMEZONE_ALIASES:
         return TIMEZONE_ALIASES[tz_input]
 
-    # Check if it's a valid IANA timezone (case-insensitive search)
-    all_timezones = available_timezones()
-    for tz in all_timezones:
-        if tz.lower() == tz_input:
-            return tz
+    # Fixed UTC offsets map onto Etc/GMT zones, whose signs are inverted
+    match = _UTC_OFFSET_RE.match(tz_input)
+    if match:
+        sign, hours = match.group(1), int(match.group(2))
+        if hours == 0:
+            return "UTC"
+        offset_tz = f"Etc/GMT{'-' if sign == '+' else '+'}{hours}"
+        return offset_tz if offset_tz.lower() in _timezones_by_lower() else None
+
+    # Check if it's a valid IANA timezone (case-insensitive lookup)
+    timezones = _timezones_by_lower()
+    if tz_input in timezones:
+        return timezones[tz_input]
 
     # Partial match (e.g., "lagos" -> "Africa/Lagos")
-    for tz in all_timezones:
-        if tz_input in tz.lower():
-            return tz
+    return next((tz for lower, tz in timezones.items() if tz_input in lower), None)
 
-    return None
+
+@lru_cache(maxsize=1)
+def _timezones_by_lower() -> dict[str, str]:
+    """
+    Map lowercased IANA timezone names to their canonical form.
+
+    Built on the first /timezone, since listing timezones walks the tz database.
+    """
+    return {tz.lower(): tz for tz in sorted(available_timezones())}
 
 
 def get_timezone_display(tz_name: str) -> str:
     """Get a friendly display string for a timezone."""
+    # Offsets only change at DST transitions, which (almost always) fall on the hour
+    return _timezone_display(tz_name, int(time.time() // 3600))
+
+
+@lru_cache(maxsize=256)
+def _timezone_display(tz_name: str, hour: int) -> str:
+    """Build the display string (cached per timezone per hour)."""
     try:
-        from datetime import datetime
         tz = ZoneInfo(tz_name)
         now = datetime.now(tz)
         offset = now.strftime("%z")
+        if tz_name.startswith("Etc/GMT"):
+            # Their names have inverted signs - show just the offset, e.g. "UTC+1"
+            hours = int(offset[:3])
+            return f"UTC{hours:+d}" if hours else "UTC"
         # Format offset as UTC+X or UTC-X
         offset_str = f"UTC{offset[:3]}:{offset[3:]}" if offset else "UTC"
         return f"{tz_name} ({offset_str})"
@@ -249,7 +276,7 @@ async def timezone_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     Examples: /timezone Lagos, /timezone UTC+1, /timezone America/New_York
     """
     chat_id = update.effective_chat.id
-    config = config_store.get(chat_id)
+    config = await config_store.aget(chat_id)
 
     # No arguments - show current timezone
     if not context.args or len(context.args) == 0:
@@ -257,16 +284,7 @@ async def timezone_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         display = get_timezone_display(config.timezone) if config.timezone else current_tz
 
         await update.message.reply_text(
-            f"*Current timezone:* `{display}`\n\n"
-            "*To change it, use:*\n"
-            "`/timezone <timezone>`\n\n"
-            "*Examples:*\n"
-            "• `/timezone Lagos`\n"
-            "• `/timezone UTC+1`\n"
-            "• `/timezone America/New_York`\n"
-            "• `/timezone Europe/London`\n"
-            "• `/timezone Asia/Tokyo`\n\n"
-            "_Your scheduled posts will trigger at your local time._",
+            _TIMEZONE_USAGE_TPL.format(display=display),
             parse_mode="Markdown"
         )
         return
@@ -277,26 +295,20 @@ async def timezone_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 
     if not resolved_tz:
         await update.message.reply_text(
-            f"Could not find timezone: `{tz_input}`\n\n"
-            "*Try one of these formats:*\n"
-            "• City name: `Lagos`, `London`, `Tokyo`\n"
-            "• UTC offset: `UTC+1`, `UTC-5`\n"
-            "• Full name: `Africa/Lagos`, `America/New_York`\n\n"
-            "_Tip: Search for your city name or use UTC offset._",
+            _UNKNOWN_TIMEZONE_TPL.format(tz_input=tz_input),
             parse_mode="Markdown"
         )
         return
 
     # Save timezone
-    config_store.update(chat_id=chat_id, timezone=resolved_tz)
+    await config_store.aupdate(chat_id=chat_id, timezone=resolved_tz)
     display = get_timezone_display(resolved_tz)
 
     # Build response
-    response = f"*Timezone set to:* `{display}`\n\n"
-
     if config.preferred_time:
-        response += f"Your daily posts will now trigger at `{config.preferred_time}` in your local time."
+        next_step = f"Your daily posts will now trigger at `{config.preferred_time}` in your local time."
     else:
-        response += "Use `/time HH:MM` to set your daily posting time."
+        next_step = "Use `/time HH:MM` to set your daily posting time."
+    response = f"*Timezone set to:* `{display}`\n\n{next_step}"
 
     await update.message.reply_text(response, parse_mode="Markdown")
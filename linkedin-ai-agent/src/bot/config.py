@@ -1,17 +1,38 @@
 """
 Per-Chat Configuration Storage
 
-Stores user preferences using Telegram chat ID as the key.
-No database required - uses JSON files for simplicity.
+Stores user preferences using Telegram chat ID as the key, as JSON
+documents in a single SQLite file (WAL mode) under the config directory.
 """
 
+import asyncio
 import json
 import os
+import sqlite3
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from typing import Optional
 from datetime import datetime
 
+# orjson (optional) encodes/decodes configs several times faster
+try:
+    import orjson
+
+    def _dumps(data: dict) -> str:
+        return orjson.dumps(data).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(data: dict) -> str:
+        return json.dumps(data, separators=(",", ":"))
+
+    _loads = json.loads
+
+# Most configs kept in memory; older chats are reread from the database
+CONFIG_CACHE_SIZE = 4096
+
 
 @dataclass
 class UserConfig:
@@ -20,6 +41,7 @@ class UserConfig:
     github_url: Optional[str] = None
     linkedin_token: Optional[str] = None
     linkedin_token_expiry: Optional[str] = None
+    linkedin_name: Optional[str] = None  # profile name, saved at /authcode
     preferred_time: Optional[str] = None  # HH:MM format
     timezone: Optional[str] = None  # IANA timezone name (e.g., "Africa/Lagos", "America/New_York")
     timezone_offset: Optional[int] = None  # Deprecated - use timezone instead
@@ -40,17 +62,66 @@ class UserConfig:
         except:
             return False
 
+    def linkedin_token_valid_for(self, seconds: int) -> bool:
+        """Check the LinkedIn token won't expire within the next `seconds`."""
+        if not self.linkedin_token or not self.linkedin_token_expiry:
+            return False
+        try:
+            expiry = datetime.fromisoformat(self.linkedin_token_expiry)
+            return (expiry - datetime.now()).total_seconds() > seconds
+        except:
+            return False
+
 
 class ConfigStore:
     """Manages per-chat configuration storage."""
 
+    # Write-through LRU cache shared by every instance, keyed by
+    # (config_dir, chat_id)
+    _cache: OrderedDict[tuple[Path, int], UserConfig] = OrderedDict()
+    _cache_lock = threading.Lock()
+
     def __init__(self, config_dir: str = "./user_configs"):
-        self.config_dir = Path(config_dir)
+        self.config_dir = Path(config_dir).resolve()
         self.config_dir.mkdir(parents=True, exist_ok=True)
 
-    def _get_config_path(self, chat_id: int) -> Path:
-        """Get path to config file for a chat."""
-        return self.config_dir / f"chat_{chat_id}.json"
+        # Serializes read-modify-write updates, so concurrent ones can't drop each other's fields
+        self._update_lock = threading.Lock()
+
+        # One long-lived autocommit connection; every statement is its own transaction
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.config_dir / "configs.db",
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS configs (
+                chat_id INTEGER PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at TEXT
+            )
+            """
+        )
+        self._import_json_configs()
+
+    def _import_json_configs(self) -> None:
+        """Move configs from the old one-JSON-file-per-chat layout into the database."""
+        for config_file in self.config_dir.glob("chat_*.json"):
+            try:
+                config = UserConfig(**_loads(config_file.read_bytes()))
+                with self._lock:
+                    # Never overwrite a config saved since
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO configs (chat_id, data, updated_at) VALUES (?, ?, ?)",
+                        (config.chat_id, _dumps(asdict(config)), config.updated_at)
+                    )
+                config_file.rename(config_file.with_name(config_file.name + ".migrated"))
+            except Exception as e:
+                print(f"Error importing config {config_file}: {e}")
 
     def get(self, chat_id: int) -> UserConfig:
         """
@@ -62,18 +133,43 @@ class ConfigStore:
         Returns:
             UserConfig object (empty if not found)
         """
-        config_path = self._get_config_path(chat_id)
+        key = (self.config_dir, chat_id)
+        cached = self._cached(key)
+        if cached is not None:
+            # Hand out a copy so callers can't mutate the cached entry
+            return replace(cached)
 
-        if config_path.exists():
-            try:
-                with open(config_path, "r") as f:
-                    data = json.load(f)
-                    return UserConfig(**data)
-            except Exception as e:
-                print(f"Error loading config for chat {chat_id}: {e}")
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT data FROM configs WHERE chat_id = ?", (chat_id,)
+                ).fetchone()
+            if row is not None:
+                config = UserConfig(**_loads(row[0]))
+                self._remember(key, config)
+                return replace(config)
+        except Exception as e:
+            print(f"Error loading config for chat {chat_id}: {e}")
 
         return UserConfig(chat_id=chat_id)
 
+    async def aget(self, chat_id: int) -> UserConfig:
+        """
+        Get configuration for a chat without blocking the event loop.
+
+        Cache hits return immediately; misses read the database in a thread.
+
+        Args:
+            chat_id: Telegram chat ID
+
+        Returns:
+            UserConfig object (empty if not found)
+        """
+        cached = self._cached((self.config_dir, chat_id))
+        if cached is not None:
+            return replace(cached)
+        return await asyncio.to_thread(self.get, chat_id)
+
     def save(self, config: UserConfig) -> None:
         """
         Save configuration for a chat.
@@ -81,8 +177,6 @@ class ConfigStore:
         Args:
             config: UserConfig object to save
         """
-        config_path = self._get_config_path(config.chat_id)
-
         # Update timestamps
         now = datetime.now().isoformat()
         if not config.created_at:
@@ -90,10 +184,32 @@ class ConfigStore:
         config.updated_at = now
 
         try:
-            with open(config_path, "w") as f:
-                json.dump(asdict(config), f, indent=2)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO configs (chat_id, data, updated_at) VALUES (?, ?, ?)",
+                    (config.chat_id, _dumps(asdict(config)), now)
+                )
         except Exception as e:
             print(f"Error saving config for chat {config.chat_id}: {e}")
+            return
+
+        self._remember((self.config_dir, config.chat_id), replace(config))
+
+    def _cached(self, key: tuple[Path, int]) -> Optional[UserConfig]:
+        """Look up a cached config, marking it recently used."""
+        with self._cache_lock:
+            config = self._cache.get(key)
+            if config is not None:
+                self._cache.move_to_end(key)
+            return config
+
+    def _remember(self, key: tuple[Path, int], config: UserConfig) -> None:
+        """Cache a config, evicting the least recently used past CONFIG_CACHE_SIZE."""
+        with self._cache_lock:
+            self._cache[key] = config
+            self._cache.move_to_end(key)
+            while len(self._cache) > CONFIG_CACHE_SIZE:
+                self._cache.popitem(last=False)
 
     def update(self, chat_id: int, **kwargs) -> UserConfig:
         """
@@ -106,15 +222,29 @@ class ConfigStore:
         Returns:
             Updated UserConfig object
         """
-        config = self.get(chat_id)
+        with self._update_lock:
+            config = self.get(chat_id)
 
-        for key, value in kwargs.items():
-            if hasattr(config, key):
-                setattr(config, key, value)
+            for key, value in kwargs.items():
+                if hasattr(config, key):
+                    setattr(config, key, value)
 
-        self.save(config)
+            self.save(config)
         return config
 
+    async def aupdate(self, chat_id: int, **kwargs) -> UserConfig:
+        """
+        Update a chat's configuration without blocking the event loop.
+
+        Args:
+            chat_id: Telegram chat ID
+            **kwargs: Fields to update
+
+        Returns:
+            Updated UserConfig object
+        """
+        return await asyncio.to_thread(self.update, chat_id, **kwargs)
+
     def delete(self, chat_id: int) -> bool:
         """
         Delete configuration for a chat.
@@ -125,12 +255,12 @@ class ConfigStore:
         Returns:
             True if deleted, False if not found
         """
-        config_path = self._get_config_path(chat_id)
+        with self._cache_lock:
+            self._cache.pop((self.config_dir, chat_id), None)
 
-        if config_path.exists():
-            config_path.unlink()
-            return True
-        return False
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM configs WHERE chat_id = ?", (chat_id,))
+        return cursor.rowcount > 0
 
     def list_all(self) -> list[UserConfig]:
         """
@@ -139,14 +269,33 @@ class ConfigStore:
         Returns:
             List of UserConfig objects
         """
-        configs = []
+        with self._lock:
+            rows = self._conn.execute("SELECT chat_id, data FROM configs").fetchall()
 
-        for config_file in self.config_dir.glob("chat_*.json"):
+        configs = []
+        for chat_id, data in rows:
             try:
-                with open(config_file, "r") as f:
-                    data = json.load(f)
-                    configs.append(UserConfig(**data))
+                configs.append(UserConfig(**_loads(data)))
             except Exception as e:
-                print(f"Error loading config {config_file}: {e}")
+                print(f"Error loading config for chat {chat_id}: {e}")
 
         return configs
+
+
+_config_store = None
+_config_store_lock = threading.Lock()
+
+
+def get_config_store() -> ConfigStore:
+    """
+    Get the process-wide config store.
+
+    The bot and the scheduler share it, so there's one database connection
+    and every reader sees the same cache.
+    """
+    global _config_store
+    if _config_store is None:
+        with _config_store_lock:
+            if _config_store is None:
+                _config_store = ConfigStore()
+    return _config_store
@@ -7,24 +7,10 @@ Main message and command handlers for the bot.
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from .config import ConfigStore
 from .approval import is_approval_message, handle_approval
 
-
-# Initialize config store
-config_store = ConfigStore()
-
-
-async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """
-    Handle /start command.
-
-    Welcome message and instructions.
-    """
-    user = update.effective_user
-    first_name = user.first_name if user else "there"
-
-    welcome_message = f"""
+# Reply texts are built once at import, not on every command
+_WELCOME_TPL = """
 *Welcome to LinkedIn AI Content Agent!*
 
 Hey {first_name}! I'm an AI agent that creates engaging LinkedIn posts from your GitHub repositories.
@@ -53,21 +39,9 @@ Hey {first_name}! I'm an AI agent that creates engaging LinkedIn posts from your
 6. I learn from engagement to improve over time
 
 Let's get started!
-    """
-
-    await update.message.reply_text(
-        welcome_message.strip(),
-        parse_mode="Markdown"
-    )
-
+""".strip()
 
-async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """
-    Handle /help command.
-
-    Shows available commands and usage.
-    """
-    help_message = """
+_HELP_MESSAGE = """
 *LinkedIn AI Content Agent - Help*
 
 *How It Works:*
@@ -107,14 +81,33 @@ Reply with: `post` • `yes` • `go` • `ship`
 
 *Learning System:*
 After posting, use `/stats 50 10` to report engagement (50 likes, 10 comments). The agent learns which topics, styles, and repos perform best for you!
+""".strip()
+
+
+async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Handle /start command.
+
+    Welcome message and instructions.
     """
+    user = update.effective_user
+    first_name = user.first_name if user else "there"
 
     await update.message.reply_text(
-        help_message.strip(),
+        _WELCOME_TPL.format(first_name=first_name),
         parse_mode="Markdown"
     )
 
 
+async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Handle /help command.
+
+    Shows available commands and usage.
+    """
+    await update.message.reply_text(_HELP_MESSAGE, parse_mode="Markdown")
+
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Handle regular text messages.
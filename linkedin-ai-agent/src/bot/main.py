@@ -4,9 +4,12 @@ LinkedIn AI Content Agent - Telegram Bot
 Main entry point for the Telegram bot.
 """
 
+import asyncio
 import os
 import sys
+from importlib import import_module
 from pathlib import Path
+from typing import Awaitable, Callable
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -19,49 +22,47 @@ from telegram.ext import (
     filters,
 )
 
-from bot.handlers import (
-    start_command,
-    help_command,
-    handle_message,
-    error_handler,
-)
-from bot.commands.connect import (
-    connect_command,
-    disconnect_command,
-    status_command,
-)
-from bot.commands.time import (
-    time_command,
-    clear_time_command,
-)
-from bot.commands.generate import (
-    generate_command,
-    refresh_command,
-)
-from bot.commands.auth import (
-    auth_command,
-    authcode_command,
-    authstatus_command,
-    deauth_command,
-)
-from bot.commands.repos import (
-    repos_command,
-    addrepo_command,
-    removerepo_command,
-)
-from bot.commands.insights import (
-    insights_command,
-    trends_command,
-    why_command,
-    stats_command,
-)
 from scheduler.cron import post_scheduler
-from bot.approval import generate_scheduled_post
-from bot.config import ConfigStore
+from bot._deps import config_store
+
+# Imported in the background once the bot is up, heaviest first
+_HANDLER_MODULES = (
+    "bot.commands.generate",
+    "bot.approval",
+    "bot.commands.insights",
+    "bot.commands.repos",
+    "bot.commands.auth",
+    "bot.commands.connect",
+    "bot.commands.time",
+    "bot.handlers",
+)
+_warmup = None
 
 
-# Config store for scheduler
-config_store = ConfigStore()
+def _lazy(module: str, name: str) -> Callable[..., Awaitable]:
+    """
+    Wrap a handler so its module is imported the first time it runs.
+
+    Keeps startup fast - a command's dependencies load only once someone
+    uses it. The import runs in a thread (some modules pull in the LLM/RAG
+    stack), so a first command never stalls other chats.
+
+    Args:
+        module: Dotted module path, e.g. "bot.commands.generate"
+        name: Handler function name in that module
+
+    Returns:
+        Async handler that forwards to the real one
+    """
+    handler = None
+
+    async def wrapper(update, context):
+        nonlocal handler
+        if handler is None:
+            handler = getattr(await asyncio.to_thread(import_module, module), name)
+        return await handler(update, context)
+
+    return wrapper
 
 
 async def scheduled_post_callback(chat_id: int) -> None:
@@ -74,7 +75,8 @@ async def scheduled_post_callback(chat_id: int) -> None:
     # Get bot from the scheduler's application context
     # This will be set when the bot starts
     if hasattr(scheduled_post_callback, 'bot'):
-        await generate_scheduled_post(
+        approval = await asyncio.to_thread(import_module, "bot.approval")
+        await approval.generate_scheduled_post(
             chat_id=chat_id,
             bot=scheduled_post_callback.bot,
             config_store=config_store
@@ -83,10 +85,23 @@ async def scheduled_post_callback(chat_id: int) -> None:
 
 async def post_init(application) -> None:
     """Called after the application is initialized and event loop is running."""
+    global _warmup
     post_scheduler.set_post_callback(scheduled_post_callback)
     post_scheduler.start()
     print("\nScheduler active for daily posts.")
 
+    # Load handler modules off the event loop now, rather than on first use
+    _warmup = asyncio.create_task(asyncio.to_thread(_import_handlers))
+
+
+def _import_handlers() -> None:
+    """Import every handler module (runs in a worker thread)."""
+    for module in _HANDLER_MODULES:
+        try:
+            import_module(module)
+        except Exception as e:
+            print(f"Could not preload {module}: {e}")
+
 
 def main() -> None:
     """
@@ -112,47 +127,47 @@ def main() -> None:
     # Store bot reference for scheduler
     scheduled_post_callback.bot = application.bot
 
-    # Add command handlers
-    application.add_handler(CommandHandler("start", start_command))
-    application.add_handler(CommandHandler("help", help_command))
+    # Add command handlers (each module is imported on first use)
+    application.add_handler(CommandHandler("start", _lazy("bot.handlers", "start_command")))
+    application.add_handler(CommandHandler("help", _lazy("bot.handlers", "help_command")))
 
     # Setup commands
-    application.add_handler(CommandHandler("connect", connect_command))
-    application.add_handler(CommandHandler("disconnect", disconnect_command))
-    application.add_handler(CommandHandler("status", status_command))
+    application.add_handler(CommandHandler("connect", _lazy("bot.commands.connect", "connect_command")))
+    application.add_handler(CommandHandler("disconnect", _lazy("bot.commands.connect", "disconnect_command")))
+    application.add_handler(CommandHandler("status", _lazy("bot.commands.connect", "status_command")))
 
     # Time commands
-    application.add_handler(CommandHandler("time", time_command))
-    application.add_handler(CommandHandler("cleartime", clear_time_command))
+    application.add_handler(CommandHandler("time", _lazy("bot.commands.time", "time_command")))
+    application.add_handler(CommandHandler("cleartime", _lazy("bot.commands.time", "clear_time_command")))
 
     # Content commands
-    application.add_handler(CommandHandler("generate", generate_command))
-    application.add_handler(CommandHandler("refresh", refresh_command))
+    application.add_handler(CommandHandler("generate", _lazy("bot.commands.generate", "generate_command")))
+    application.add_handler(CommandHandler("refresh", _lazy("bot.commands.generate", "refresh_command")))
 
     # LinkedIn auth commands
-    application.add_handler(CommandHandler("auth", auth_command))
-    application.add_handler(CommandHandler("authcode", authcode_command))
-    application.add_handler(CommandHandler("authstatus", authstatus_command))
-    application.add_handler(CommandHandler("deauth", deauth_command))
+    application.add_handler(CommandHandler("auth", _lazy("bot.commands.auth", "auth_command")))
+    application.add_handler(CommandHandler("authcode", _lazy("bot.commands.auth", "authcode_command")))
+    application.add_handler(CommandHandler("authstatus", _lazy("bot.commands.auth", "authstatus_command")))
+    application.add_handler(CommandHandler("deauth", _lazy("bot.commands.auth", "deauth_command")))
 
     # Repository management commands (Agent Phase 4)
-    application.add_handler(CommandHandler("repos", repos_command))
-    application.add_handler(CommandHandler("addrepo", addrepo_command))
-    application.add_handler(CommandHandler("removerepo", removerepo_command))
+    application.add_handler(CommandHandler("repos", _lazy("bot.commands.repos", "repos_command")))
+    application.add_handler(CommandHandler("addrepo", _lazy("bot.commands.repos", "addrepo_command")))
+    application.add_handler(CommandHandler("removerepo", _lazy("bot.commands.repos", "removerepo_command")))
 
     # Agent insight commands (Agent Phase 4)
-    application.add_handler(CommandHandler("insights", insights_command))
-    application.add_handler(CommandHandler("trends", trends_command))
-    application.add_handler(CommandHandler("why", why_command))
-    application.add_handler(CommandHandler("stats", stats_command))
+    application.add_handler(CommandHandler("insights", _lazy("bot.commands.insights", "insights_command")))
+    application.add_handler(CommandHandler("trends", _lazy("bot.commands.insights", "trends_command")))
+    application.add_handler(CommandHandler("why", _lazy("bot.commands.insights", "why_command")))
+    application.add_handler(CommandHandler("stats", _lazy("bot.commands.insights", "stats_command")))
 
     # Message handler (for approvals and other text)
     application.add_handler(
-        MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message)
+        MessageHandler(filters.TEXT & ~filters.COMMAND, _lazy("bot.handlers", "handle_message"))
     )
 
     # Error handler
-    application.add_error_handler(error_handler)
+    application.add_error_handler(_lazy("bot.handlers", "error_handler"))
 
     # Start the bot
     print("Bot is running! Press Ctrl+C to stop.")
@@ -0,0 +1,106 @@
+"""
+Pending Post Registry
+
+Holds the draft each chat is waiting to approve. Keyed by chat rather than
+kept in per-user bot data, so scheduled drafts can be approved too.
+
+Drafts are written through to the agent database, so a restart between
+generating and approving doesn't throw the post away. Database reads and
+writes run in a thread, so the registry is async.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from ._deps import get_db
+
+# Drafts nobody approved within a day are dropped
+PENDING_TTL = 24 * 60 * 60
+
+
+@dataclass
+class PendingPost:
+    """A generated draft awaiting approval."""
+    text: str
+    repo: str
+    created: float
+
+
+_pending: dict[int, PendingPost] = {}
+
+# Bumped on every set/pop, so a database read that raced one is discarded
+_writes: dict[int, int] = {}
+
+
+async def set_pending(chat_id: int, text: str, repo: str) -> None:
+    """
+    Store the draft a chat should approve next, replacing any older one.
+
+    Args:
+        chat_id: Telegram chat ID
+        text: Post text
+        repo: Repository URL the post is about
+    """
+    now = time.monotonic()
+
+    # Sweep stale drafts while we're here
+    for stale_id in [cid for cid, p in _pending.items() if now - p.created > PENDING_TTL]:
+        del _pending[stale_id]
+
+    _pending[chat_id] = PendingPost(text, repo, now)
+    _writes[chat_id] = _writes.get(chat_id, 0) + 1
+    await asyncio.to_thread(_save_draft, chat_id, text, repo)
+
+
+async def get_pending(chat_id: int) -> Optional[PendingPost]:
+    """Get a chat's draft, or None if there isn't one (or it expired)."""
+    pending = _pending.get(chat_id)
+    if pending is None:
+        # Not in memory - the bot may have restarted since it was generated
+        writes = _writes.get(chat_id, 0)
+        pending = await asyncio.to_thread(_load_draft, chat_id)
+        if _writes.get(chat_id, 0) != writes:
+            # Set or popped while we were reading - the row may be stale
+            pending = _pending.get(chat_id)
+        if pending is None:
+            return None
+        _pending[chat_id] = pending
+
+    if time.monotonic() - pending.created > PENDING_TTL:
+        await pop_pending(chat_id)
+        return None
+    return pending
+
+
+async def pop_pending(chat_id: int) -> Optional[PendingPost]:
+    """Remove and return a chat's draft."""
+    pending = _pending.pop(chat_id, None)
+    _writes[chat_id] = _writes.get(chat_id, 0) + 1
+    return await asyncio.to_thread(_delete_draft, chat_id, pending)
+
+
+def _save_draft(chat_id: int, text: str, repo: str) -> None:
+    """Write a chat's draft to the database."""
+    get_db().save_draft(str(chat_id), text, repo, max_age_hours=PENDING_TTL // 3600)
+
+
+def _delete_draft(chat_id: int, pending: Optional[PendingPost]) -> Optional[PendingPost]:
+    """Delete a chat's stored draft, reading it back first if it wasn't in memory."""
+    if pending is None:
+        pending = _load_draft(chat_id)
+    get_db().delete_draft(str(chat_id))
+    return pending
+
+
+def _load_draft(chat_id: int) -> Optional[PendingPost]:
+    """Read a chat's draft back from the database."""
+    draft = get_db().get_draft(str(chat_id), max_age_hours=PENDING_TTL // 3600)
+    if draft is None:
+        return None
+    return PendingPost(
+        draft["content"],
+        draft["repo_url"],
+        time.monotonic() - draft["age_seconds"]
+    )
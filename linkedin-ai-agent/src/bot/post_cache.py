@@ -0,0 +1,86 @@
+"""
+Generated Post Cache
+
+Remembers the draft generated for a given repo state, so asking again with
+no new commits and the same retrieved code skips the LLM call.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# Drafts go stale after a day even if the repo hasn't moved
+POST_CACHE_TTL = 24 * 60 * 60
+POST_CACHE_SIZE = 256
+
+# (repo_url, head_sha, context digest, post_style) -> (created_at, post)
+_post_cache: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def post_cache_key(
+    repo_url: str,
+    head_sha: Optional[str],
+    code_context: str,
+    post_style: str = "adaptive"
+) -> Optional[tuple]:
+    """
+    Build the cache key for a generation request.
+
+    Args:
+        repo_url: GitHub repository URL
+        head_sha: Commit the clone is at (None disables caching)
+        code_context: Retrieved code context fed to the LLM
+        post_style: Post style passed to the generator
+
+    Returns:
+        Cache key, or None if the request can't be cached
+    """
+    if not head_sha:
+        return None
+    digest = hashlib.blake2b(code_context.encode(), digest_size=16).hexdigest()
+    return (repo_url, head_sha, digest, post_style)
+
+
+def get_cached_post(key: Optional[tuple]) -> Optional[str]:
+    """Return the cached draft for a key, or None on a miss."""
+    if key is None:
+        return None
+
+    with _lock:
+        entry = _post_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > POST_CACHE_TTL:
+            del _post_cache[key]
+            return None
+        _post_cache.move_to_end(key)
+        return entry[1]
+
+
+def cache_post(key: Optional[tuple], post: str) -> None:
+    """Store a freshly generated draft."""
+    if key is None:
+        return
+
+    with _lock:
+        _post_cache[key] = (time.monotonic(), post)
+        _post_cache.move_to_end(key)
+        while len(_post_cache) > POST_CACHE_SIZE:
+            _post_cache.popitem(last=False)
+
+
+def forget_post(post: str) -> None:
+    """Drop a draft once it's been published, so it's never offered again."""
+    with _lock:
+        for key in [k for k, (_, cached) in _post_cache.items() if cached == post]:
+            del _post_cache[key]
+
+
+def forget_repo(repo_url: str) -> None:
+    """Drop every cached draft for a repo (e.g. after /refresh)."""
+    with _lock:
+        for key in [k for k in _post_cache if k[0] == repo_url]:
+            del _post_cache[key]
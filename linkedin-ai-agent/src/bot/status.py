@@ -0,0 +1,131 @@
+"""
+Status Message Updates
+
+Coalesces progress edits to a bot status message so a multi-step command
+doesn't spend one Telegram API call per step, and sends final replies
+without holding the handler open.
+"""
+
+import asyncio
+import time
+from contextlib import suppress
+from typing import Awaitable, Optional
+
+# Strong references so pending sends aren't garbage collected mid-flight
+_background: set[asyncio.Task] = set()
+
+
+def send(coro: Awaitable) -> asyncio.Task:
+    """
+    Send a reply in the background.
+
+    Use for a handler's last message, where nothing needs the sent message
+    back; the handler (and its chat lock) finishes without waiting on the
+    Telegram round trip.
+
+    Args:
+        coro: The send coroutine, e.g. update.message.reply_text(...)
+
+    Returns:
+        The background task
+    """
+    task = asyncio.create_task(_log_exc(coro))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    return task
+
+
+async def _log_exc(coro: Awaitable) -> None:
+    """Await a background send, logging instead of raising on failure."""
+    try:
+        await coro
+    except Exception as e:
+        print(f"Failed to send message: {e}")
+
+
+class StatusUpdater:
+    """Rate-limited editor for a single status message."""
+
+    def __init__(self, message, min_interval: float = 1.0):
+        """
+        Initialize the updater.
+
+        Args:
+            message: The Telegram message to edit
+            min_interval: Minimum seconds between edits (Telegram allows
+                about one edit per second per chat)
+        """
+        self.message = message
+        self.min_interval = min_interval
+        self._last = time.monotonic()  # the message itself was just sent
+        self._shown: Optional[tuple[str, dict]] = None
+        self._pending: Optional[tuple[str, dict]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def set(self, text: str, **kwargs) -> None:
+        """
+        Show a progress update.
+
+        Sent in the background as soon as the last edit is far enough
+        behind; until then it's held, and replaced if another update
+        comes in first.
+
+        Args:
+            text: New message text
+            **kwargs: Extra edit_text arguments (e.g. parse_mode)
+        """
+        self._pending = (text, kwargs)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        """Send held updates, no faster than min_interval, until none are left."""
+        while self._pending is not None:
+            wait = self._last + self.min_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            update, self._pending = self._pending, None
+            if update == self._shown:
+                continue
+            self._last = time.monotonic()
+            try:
+                await self.message.edit_text(update[0], **update[1])
+                self._shown = update
+            except Exception as e:
+                # A failed progress update isn't worth failing the command
+                print(f"Status update failed: {e}")
+
+    async def _stop(self) -> None:
+        """Cancel background sending - whatever comes next supersedes it."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
+
+    async def flush(self, text: Optional[str] = None, **kwargs) -> None:
+        """
+        Show the final text right away.
+
+        Args:
+            text: Final message text (defaults to the last held update)
+            **kwargs: Extra edit_text arguments (e.g. parse_mode)
+        """
+        if text is not None:
+            self._pending = (text, kwargs)
+
+        await self._stop()
+
+        update, self._pending = self._pending, None
+        if update is not None and update != self._shown:
+            self._last = time.monotonic()
+            await self.message.edit_text(update[0], **update[1])
+            self._shown = update
+
+    async def delete(self) -> None:
+        """Drop held updates and delete the status message."""
+        self._pending = None
+        await self._stop()
+        await self.message.delete()
@@ -26,7 +26,8 @@ class PostGenerator:
         self.llm = ChatOpenAI(
             model=model,
             temperature=0.7,
-            openai_api_key=os.getenv("OPENAI_API_KEY")
+            openai_api_key=os.getenv("OPENAI_API_KEY"),
+            max_retries=5  # rate-limited calls back off exponentially
         )
 
         self.system_prompt = """You are a Senior Technical Evangelist who writes engaging LinkedIn posts about code and software development.
@@ -57,6 +57,9 @@ class LinkedInOAuth:
             "http://localhost:8080/callback"
         )
 
+        # Reuse connections across token exchanges and profile lookups
+        self.session = requests.Session()
+
         # Store state tokens for CSRF protection
         self._pending_states: dict[str, int] = {}  # state -> chat_id
 
@@ -124,7 +127,7 @@ class LinkedInOAuth:
             "client_secret": self.client_secret,
         }
 
-        response = requests.post(
+        response = self.session.post(
             self.TOKEN_URL,
             data=data,
             headers={"Content-Type": "application/x-www-form-urlencoded"}
@@ -155,7 +158,7 @@ class LinkedInOAuth:
         Returns:
             User profile data
         """
-        response = requests.get(
+        response = self.session.get(
             self.PROFILE_URL,
             headers={"Authorization": f"Bearer {access_token}"}
         )
@@ -6,6 +6,7 @@ Publishes posts to LinkedIn using the API.
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
 from dataclasses import dataclass
 
@@ -30,9 +31,16 @@ class LinkedInPoster:
     USERINFO_URL = "https://api.linkedin.com/v2/userinfo"
     POSTS_URL = "https://api.linkedin.com/v2/posts"
 
-    def __init__(self):
-        """Initialize LinkedIn poster."""
-        pass
+    def __init__(self, pool_size: int = 32):
+        """
+        Initialize LinkedIn poster.
+
+        Args:
+            pool_size: Kept-alive connections to the LinkedIn API
+        """
+        # One session so approvals reuse the TLS connection to api.linkedin.com
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
 
     def get_user_urn(self, access_token: str) -> str:
         """
@@ -44,7 +52,7 @@ class LinkedInPoster:
         Returns:
             User URN string (e.g., "urn:li:person:ABC123")
         """
-        response = requests.get(
+        response = self.session.get(
             self.USERINFO_URL,
             headers={"Authorization": f"Bearer {access_token}"}
         )
@@ -99,7 +107,7 @@ class LinkedInPoster:
             }
 
             # Try the newer Posts API first
-            response = requests.post(
+            response = self.session.post(
                 self.POSTS_URL,
                 headers={
                     "Authorization": f"Bearer {access_token}",
@@ -163,7 +171,7 @@ class LinkedInPoster:
             True if deleted successfully
         """
         try:
-            response = requests.delete(
+            response = self.session.delete(
                 f"{self.POSTS_URL}/{post_id}",
                 headers={
                     "Authorization": f"Bearer {access_token}",
@@ -198,7 +206,7 @@ class LinkedInPoster:
         try:
             # LinkedIn Marketing API for social actions
             # Note: This endpoint requires Marketing Developer Platform access
-            response = requests.get(
+            response = self.session.get(
                 f"https://api.linkedin.com/v2/socialActions/{post_id}",
                 headers={
                     "Authorization": f"Bearer {marketing_token}",
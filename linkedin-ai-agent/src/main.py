@@ -50,7 +50,7 @@ def index_repository(repo_url: str, force_refresh: bool = False) -> None:
     # Step 3: Chunk files
     print("Step 3: Chunking code files...")
     chunker = CodeChunker()
-    chunks = chunker.chunk_files(files, repo_path)
+    chunks = chunker.chunk_files_parallel(files, repo_path)
     documents = chunker.create_chunk_documents(chunks)
     print(f"Created {len(documents)} document chunks\n")
 
@@ -4,10 +4,23 @@ Code Chunker
 Splits code files into manageable chunks for embedding.
 """
 
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
 from pathlib import Path
+from typing import Iterator
 from dataclasses import dataclass
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
+# Below this many files, process start-up costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+# Size of the chunking process pool, shared by every caller in the process
+CHUNK_WORKERS = min(4, os.cpu_count() or 1)
+
 
 @dataclass
 class CodeChunk:
@@ -153,6 +166,48 @@ class CodeChunker:
         print(f"Total chunks created: {len(all_chunks)}")
         return all_chunks
 
+    def chunk_files_parallel(
+        self,
+        file_paths: list[Path],
+        repo_root: Path
+    ) -> list[CodeChunk]:
+        """
+        Chunk multiple files across worker processes.
+
+        Splitting is CPU-bound, so large repos are spread over a shared
+        process pool; small ones go through chunk_files.
+
+        Args:
+            file_paths: List of file paths to chunk
+            repo_root: Root path of the repository
+
+        Returns:
+            List of all CodeChunk objects, in file order
+        """
+        if len(file_paths) < PARALLEL_MIN_FILES:
+            return self.chunk_files(file_paths, repo_root)
+
+        all_chunks = []
+
+        try:
+            results = _get_pool().map(
+                _chunk_one, file_paths, repeat(repo_root),
+                repeat(self.chunk_size), repeat(self.chunk_overlap),
+                chunksize=max(1, len(file_paths) // (CHUNK_WORKERS * 4))
+            )
+            for file_path, chunks in zip(file_paths, results):
+                all_chunks.extend(chunks)
+                if chunks:
+                    print(f"Chunked {file_path.name}: {len(chunks)} chunks")
+        except BrokenProcessPool as e:
+            # A worker died - start a fresh pool next time, chunk this repo here
+            print(f"Chunking pool failed ({e}), chunking in-process")
+            _reset_pool()
+            return self.chunk_files(file_paths, repo_root)
+
+        print(f"Total chunks created: {len(all_chunks)}")
+        return all_chunks
+
     def create_chunk_documents(self, chunks: list[CodeChunk]) -> list[dict]:
         """
         Convert chunks to document format for embedding.
@@ -185,3 +240,63 @@ class CodeChunker:
             documents.append(doc)
 
         return documents
+
+    def iter_document_batches(
+        self,
+        chunks: list[CodeChunk],
+        batch_size: int = 100
+    ) -> Iterator[list[dict]]:
+        """
+        Convert chunks to documents a batch at a time.
+
+        Only one batch of documents is alive at once, so large repos don't
+        hold every embedding payload in memory.
+
+        Args:
+            chunks: List of CodeChunk objects
+            batch_size: Documents per batch
+
+        Yields:
+            Lists of document dicts with content and metadata
+        """
+        for start in range(0, len(chunks), batch_size):
+            yield self.create_chunk_documents(chunks[start:start + batch_size])
+
+
+# Process pool for chunk_files_parallel (started on first use)
+_pool = None
+_pool_lock = threading.Lock()
+
+# Per-process chunkers for pool workers, by (chunk_size, chunk_overlap)
+_worker_chunkers: dict[tuple[int, int], CodeChunker] = {}
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Spawned, not forked: chunking starts from a worker thread,
+                # and a fork could copy a lock another thread holds
+                # into the children
+                _pool = ProcessPoolExecutor(
+                    max_workers=CHUNK_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _chunk_one(file_path: Path, repo_root: Path, chunk_size: int, chunk_overlap: int) -> list[CodeChunk]:
+    key = (chunk_size, chunk_overlap)
+    chunker = _worker_chunkers.get(key)
+    if chunker is None:
+        chunker = _worker_chunkers[key] = CodeChunker(chunk_size, chunk_overlap)
+    return chunker.chunk_file(file_path, repo_root)
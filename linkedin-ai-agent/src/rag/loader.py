@@ -7,6 +7,7 @@ Fetches and clones public GitHub repositories for analysis.
 import os
 import shutil
 from pathlib import Path
+from typing import Optional
 from git import Repo
 from git.exc import GitCommandError
 
@@ -102,6 +103,27 @@ class RepoLoader:
             print(f"Error getting git diff: {e}")
             return ""
 
+    def get_head_sha(self, github_url: str) -> Optional[str]:
+        """
+        Get the commit the local clone is checked out at.
+
+        Args:
+            github_url: GitHub repository URL
+
+        Returns:
+            Full commit SHA, or None if the repo isn't cloned
+        """
+        repo_path = self._get_repo_path(github_url)
+
+        if not repo_path.exists():
+            return None
+
+        try:
+            return Repo(repo_path).head.commit.hexsha
+        except Exception as e:
+            print(f"Error reading HEAD: {e}")
+            return None
+
     def get_file_list(self, github_url: str) -> list[Path]:
         """
         Get list of code files in the repository.
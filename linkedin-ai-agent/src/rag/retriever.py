@@ -4,9 +4,26 @@ Code Retriever
 Retrieves relevant code context for post generation.
 """
 
+from collections import namedtuple
+
 from .store import VectorStore
 
 
+# One search result (file_path is None if the chunk has no file metadata)
+RetrievalHit = namedtuple("RetrievalHit", "content file_path score metadata")
+
+
+def _to_hit(document: dict) -> RetrievalHit:
+    """Convert a vector store result dict into a RetrievalHit."""
+    metadata = document["metadata"]
+    return RetrievalHit(
+        document["content"],
+        metadata.get("file_path"),
+        document["similarity_score"],
+        metadata
+    )
+
+
 class CodeRetriever:
     """Retrieves relevant code context using semantic search."""
 
@@ -24,7 +41,7 @@ class CodeRetriever:
         query: str,
         repo_url: str,
         k: int = 5
-    ) -> list[dict]:
+    ) -> list[RetrievalHit]:
         """
         Retrieve relevant code context for a query.
 
@@ -34,13 +51,50 @@ class CodeRetriever:
             k: Number of results to return
 
         Returns:
-            List of relevant code chunks with metadata
+            List of relevant code chunks
         """
-        return self.vector_store.similarity_search(
-            query=query,
-            k=k,
-            repo_url=repo_url
-        )
+        return [
+            _to_hit(document)
+            for document in self.vector_store.similarity_search(query=query, k=k, repo_url=repo_url)
+        ]
+
+    def ping(self) -> bool:
+        """Check that the vector store is reachable before issuing searches."""
+        return self.vector_store.ping()
+
+    def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """Embed several queries at once so they can be reused across repos."""
+        return self.vector_store.embed_queries(queries)
+
+    def get_relevant_context_batch(
+        self,
+        queries: list[str],
+        repo_url: str,
+        k: int = 5,
+        query_vectors: list[list[float]] = None
+    ) -> list[list[RetrievalHit]]:
+        """
+        Retrieve relevant code context for several queries with one embedding call.
+
+        Args:
+            queries: Search queries
+            repo_url: GitHub repository URL
+            k: Number of results per query
+            query_vectors: Precomputed embeddings for the queries (from embed_queries)
+
+        Returns:
+            One list of code chunks per query, in the same order
+        """
+        if query_vectors is None:
+            query_vectors = self.embed_queries(queries)
+
+        return [
+            [
+                _to_hit(document)
+                for document in self.vector_store.similarity_search_by_vector(vector, k=k, repo_url=repo_url)
+            ]
+            for vector in query_vectors
+        ]
 
     def get_code_for_post(
         self,
@@ -73,7 +127,7 @@ class CodeRetriever:
         seen_files = set()
         unique_results = []
         for result in all_results:
-            file_path = result["metadata"].get("file_path", "")
+            file_path = result.file_path or ""
             if file_path not in seen_files:
                 seen_files.add(file_path)
                 unique_results.append(result)
@@ -96,19 +150,20 @@ class CodeRetriever:
         # Extract clean code snippets
         code_snippets = []
         for result in unique_results[:3]:
-            content = result["content"]
+            content = result.content
             # Remove the header we added during chunking
             if "---\n" in content:
                 content = content.split("---\n", 1)[-1]
+            metadata = result.metadata
             code_snippets.append({
                 "code": content.strip(),
-                "file": result["metadata"].get("file_path", "unknown"),
-                "lines": f"{result['metadata'].get('start_line', '?')}-{result['metadata'].get('end_line', '?')}"
+                "file": result.file_path or "unknown",
+                "lines": f"{metadata.get('start_line', '?')}-{metadata.get('end_line', '?')}"
             })
 
         return {
-            "main_context": main_result["content"],
-            "supporting_context": "\n\n".join([r["content"] for r in supporting_results]),
+            "main_context": main_result.content,
+            "supporting_context": "\n\n".join([r.content for r in supporting_results]),
             "code_snippets": code_snippets,
             "files_analyzed": list(seen_files)
         }
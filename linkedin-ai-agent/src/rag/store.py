@@ -4,8 +4,12 @@ Vector Store
 Stores and manages code embeddings using ChromaDB.
 """
 
+import hashlib
 import os
+import threading
+import time
 from pathlib import Path
+from typing import Iterable
 from chromadb import PersistentClient
 from chromadb.config import Settings
 from langchain_community.vectorstores import Chroma
@@ -14,10 +18,65 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Embedding requests allowed per minute, shared by every indexing job
+EMBED_DOCS_PER_MINUTE = int(os.getenv("EMBED_DOCS_PER_MINUTE", "3000"))
+
+# New chunks sent per embedding request during a sync
+EMBED_BATCH_SIZE = 128
+
+
+class EmbeddingThrottle:
+    """
+    Token bucket for embedding calls.
+
+    Waits *before* sending a batch when the budget is spent, instead of
+    letting the provider answer with a 429 and retrying.
+    """
+
+    def __init__(self, docs_per_minute: int):
+        """
+        Initialize the throttle.
+
+        Args:
+            docs_per_minute: Sustained number of documents to embed per minute
+        """
+        self.capacity = docs_per_minute
+        self.rate = docs_per_minute / 60.0
+        self._tokens = float(docs_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, count: int) -> None:
+        """
+        Block until `count` documents may be embedded.
+
+        Args:
+            count: Documents in the next batch
+        """
+        count = min(count, self.capacity)
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= count:
+                    self._tokens -= count
+                    return
+
+                time.sleep((count - self._tokens) / self.rate)
+
+
+_embed_throttle = EmbeddingThrottle(EMBED_DOCS_PER_MINUTE)
+
 
 class VectorStore:
     """Manages code embeddings storage with ChromaDB."""
 
+    # Bumped whenever any collection is (re)indexed or deleted, so callers
+    # caching search results can tell when they've gone stale
+    generation = 0
+
     def __init__(
         self,
         persist_dir: str = "./chroma_db",
@@ -40,8 +99,10 @@ class VectorStore:
             openai_api_key=os.getenv("OPENAI_API_KEY")
         )
 
-        # Initialize or load existing store
-        self.vectorstore = None
+        # One Chroma handle per collection, so concurrent calls for
+        # different repos never share (or swap) a handle
+        self._collections: dict[str, Chroma] = {}
+        self._collections_lock = threading.Lock()
 
     def _get_collection_name(self, repo_url: str) -> str:
         """Generate collection name from repo URL."""
@@ -50,10 +111,32 @@ class VectorStore:
         # ChromaDB collection names must be alphanumeric with underscores
         return f"repo_{repo_name.replace('-', '_').replace('.', '_')}"
 
+    def _get_collection(self, repo_url: str) -> Chroma:
+        """
+        Get the Chroma handle for a repo's collection, creating it if needed.
+
+        Args:
+            repo_url: GitHub repository URL
+
+        Returns:
+            Chroma vector store bound to the repo's collection
+        """
+        collection_name = self._get_collection_name(repo_url)
+        with self._collections_lock:
+            store = self._collections.get(collection_name)
+            if store is None:
+                store = self._collections[collection_name] = Chroma(
+                    collection_name=collection_name,
+                    embedding_function=self.embeddings,
+                    persist_directory=str(self.persist_dir)
+                )
+            return store
+
     def add_documents(
         self,
         documents: list[dict],
-        repo_url: str
+        repo_url: str,
+        embeddings: list[list[float]] = None
     ) -> None:
         """
         Add documents to the vector store.
@@ -61,28 +144,111 @@ class VectorStore:
         Args:
             documents: List of document dicts with 'content' and 'metadata'
             repo_url: GitHub repository URL (used for collection name)
+            embeddings: Precomputed embeddings, one per document (embedded here if omitted)
         """
-        collection_name = self._get_collection_name(repo_url)
+        self._add_to(self._get_collection(repo_url), documents, repo_url, embeddings)
 
-        texts = [doc["content"] for doc in documents]
-        metadatas = [doc["metadata"] for doc in documents]
+    def _add_to(
+        self,
+        store: Chroma,
+        documents: list[dict],
+        repo_url: str,
+        embeddings: list[list[float]] = None
+    ) -> None:
+        """Add documents to an already-resolved collection (see add_documents)."""
+        # Content-hash ids: identical chunks collapse to one entry and
+        # refreshes can tell which chunks they already have
+        unique = {}
+        for i, doc in enumerate(documents):
+            unique.setdefault(self._document_id(doc["content"]), i)
+        ids = list(unique)
+        texts = [documents[i]["content"] for i in unique.values()]
+        metadatas = [documents[i]["metadata"] for i in unique.values()]
 
         # Add repo URL to metadata
         for metadata in metadatas:
             metadata["repo_url"] = repo_url
 
-        print(f"Adding {len(texts)} documents to collection: {collection_name}")
+        print(f"Adding {len(texts)} documents to collection: {self._get_collection_name(repo_url)}")
 
-        self.vectorstore = Chroma.from_texts(
-            texts=texts,
-            embedding=self.embeddings,
-            metadatas=metadatas,
-            collection_name=collection_name,
-            persist_directory=str(self.persist_dir)
-        )
+        if embeddings is not None:
+            store._collection.upsert(
+                ids=ids,
+                embeddings=[embeddings[i] for i in unique.values()],
+                documents=texts,
+                metadatas=metadatas
+            )
+        else:
+            store.add_texts(texts=texts, metadatas=metadatas, ids=ids)
+        VectorStore.generation += 1
 
         print(f"Documents added and persisted to {self.persist_dir}")
 
+    @staticmethod
+    def _document_id(content: str) -> str:
+        """Stable id for a chunk (its content includes the file path and lines)."""
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+    def sync_document_batches(
+        self,
+        batches: Iterable[list[dict]],
+        repo_url: str
+    ) -> tuple[int, int, int]:
+        """
+        Bring a repo's collection in line with a fresh set of documents.
+
+        Only chunks the collection doesn't already hold are embedded, in
+        EMBED_BATCH_SIZE requests throttled to the embedding rate limit;
+        chunks that no longer exist are deleted.
+
+        Args:
+            batches: Iterable of document lists (see CodeChunker.iter_document_batches)
+            repo_url: GitHub repository URL (used for collection name)
+
+        Returns:
+            (documents seen, documents embedded, documents deleted)
+        """
+        store = self._get_collection(repo_url)
+        existing = set(store._collection.get(include=[])["ids"])
+        seen = set()
+        fresh = []
+        added = 0
+
+        # New chunks are pooled across batches, so a refresh that only
+        # touched a few files still fills each embedding request
+        for batch in batches:
+            for doc in batch:
+                doc_id = self._document_id(doc["content"])
+                if doc_id not in seen:
+                    seen.add(doc_id)
+                    if doc_id not in existing:
+                        fresh.append(doc)
+
+            while len(fresh) >= EMBED_BATCH_SIZE:
+                self._embed_and_add(store, fresh[:EMBED_BATCH_SIZE], repo_url)
+                added += EMBED_BATCH_SIZE
+                del fresh[:EMBED_BATCH_SIZE]
+
+        if fresh:
+            self._embed_and_add(store, fresh, repo_url)
+            added += len(fresh)
+
+        stale = list(existing - seen)
+        if stale:
+            # Delete in slices to stay under Chroma's batch size limit
+            for start in range(0, len(stale), 1000):
+                store.delete(ids=stale[start:start + 1000])
+            VectorStore.generation += 1
+
+        print(f"Synced {repo_url}: {len(seen)} chunks, {added} embedded, {len(stale)} removed")
+        return len(seen), added, len(stale)
+
+    def _embed_and_add(self, store: Chroma, documents: list[dict], repo_url: str) -> None:
+        """Embed documents in one request and store them."""
+        _embed_throttle.acquire(len(documents))
+        embeddings = self.embeddings.embed_documents([doc["content"] for doc in documents])
+        self._add_to(store, documents, repo_url, embeddings=embeddings)
+
     def load_collection(self, repo_url: str) -> bool:
         """
         Load an existing collection for a repo.
@@ -91,21 +257,15 @@ class VectorStore:
             repo_url: GitHub repository URL
 
         Returns:
-            True if collection exists and was loaded, False otherwise
+            True if collection exists and has documents, False otherwise
         """
-        collection_name = self._get_collection_name(repo_url)
-
         try:
-            self.vectorstore = Chroma(
-                collection_name=collection_name,
-                embedding_function=self.embeddings,
-                persist_directory=str(self.persist_dir)
-            )
+            store = self._get_collection(repo_url)
 
             # Check if collection has documents
-            count = self.vectorstore._collection.count()
+            count = store._collection.count()
             if count > 0:
-                print(f"Loaded collection {collection_name} with {count} documents")
+                print(f"Loaded collection {store._collection.name} with {count} documents")
                 return True
             return False
 
@@ -113,6 +273,33 @@ class VectorStore:
             print(f"Could not load collection: {e}")
             return False
 
+    def indexed_repos(self, repo_urls: list[str]) -> set[str]:
+        """
+        Find which repos have been indexed, with one collection listing.
+
+        Doesn't create missing collections as a side effect.
+
+        Args:
+            repo_urls: GitHub repository URLs
+
+        Returns:
+            The subset of repo_urls whose collections exist and have documents
+        """
+        try:
+            client = PersistentClient(path=str(self.persist_dir))
+            # Older chromadb returns Collection objects, newer just names
+            existing = {getattr(c, "name", c) for c in client.list_collections()}
+
+            indexed = set()
+            for repo_url in repo_urls:
+                collection_name = self._get_collection_name(repo_url)
+                if collection_name in existing and client.get_collection(collection_name).count() > 0:
+                    indexed.add(repo_url)
+            return indexed
+        except Exception as e:
+            print(f"Could not list collections: {e}")
+            return set()
+
     def similarity_search(
         self,
         query: str,
@@ -125,19 +312,76 @@ class VectorStore:
         Args:
             query: Search query
             k: Number of results to return
-            repo_url: Optional repo URL to load specific collection
+            repo_url: GitHub repository URL whose collection to use
 
         Returns:
             List of matching documents with content and metadata
         """
-        if repo_url and not self.vectorstore:
-            self.load_collection(repo_url)
+        if not repo_url:
+            print("No repository given to search")
+            return []
+
+        results = self._get_collection(repo_url).similarity_search_with_score(query, k=k)
+
+        documents = []
+        for doc, score in results:
+            documents.append({
+                "content": doc.page_content,
+                "metadata": doc.metadata,
+                "similarity_score": float(score)
+            })
+
+        return documents
+
+    def ping(self) -> bool:
+        """
+        Check that the vector database is reachable.
 
-        if not self.vectorstore:
-            print("No vector store loaded")
+        Returns:
+            True if ChromaDB answers a heartbeat, False otherwise
+        """
+        try:
+            PersistentClient(path=str(self.persist_dir)).heartbeat()
+            return True
+        except Exception as e:
+            print(f"Vector store unavailable: {e}")
+            return False
+
+    def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """
+        Embed several search queries in one embedding call.
+
+        Args:
+            queries: Search queries
+
+        Returns:
+            One embedding vector per query
+        """
+        return self.embeddings.embed_documents(queries)
+
+    def similarity_search_by_vector(
+        self,
+        embedding: list[float],
+        k: int = 5,
+        repo_url: str = None
+    ) -> list[dict]:
+        """
+        Search for documents similar to an already-embedded query.
+
+        Args:
+            embedding: Query embedding (see embed_queries)
+            k: Number of results to return
+            repo_url: GitHub repository URL whose collection to use
+
+        Returns:
+            List of matching documents with content and metadata
+        """
+        if not repo_url:
+            print("No repository given to search")
             return []
 
-        results = self.vectorstore.similarity_search_with_score(query, k=k)
+        store = self._get_collection(repo_url)
+        results = store.similarity_search_by_vector_with_relevance_scores(embedding, k=k)
 
         documents = []
         for doc, score in results:
@@ -160,7 +404,10 @@ class VectorStore:
 
         try:
             client = PersistentClient(path=str(self.persist_dir))
-            client.delete_collection(collection_name)
+            with self._collections_lock:
+                client.delete_collection(collection_name)
+                self._collections.pop(collection_name, None)
+            VectorStore.generation += 1
             print(f"Deleted collection: {collection_name}")
         except Exception as e:
             print(f"Error deleting collection: {e}")
@@ -170,16 +417,13 @@ class VectorStore:
         Get a LangChain retriever for the vector store.
 
         Args:
-            repo_url: Optional repo URL to load specific collection
+            repo_url: GitHub repository URL whose collection to use
             k: Number of documents to retrieve
 
         Returns:
             LangChain retriever
         """
-        if repo_url and not self.vectorstore:
-            self.load_collection(repo_url)
-
-        if not self.vectorstore:
-            raise ValueError("No vector store loaded")
+        if not repo_url:
+            raise ValueError("No repository given for the retriever")
 
-        return self.vectorstore.as_retriever(search_kwargs={"k": k})
+        return self._get_collection(repo_url).as_retriever(search_kwargs={"k": k})
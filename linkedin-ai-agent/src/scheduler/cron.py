@@ -16,7 +16,13 @@ from apscheduler.triggers.cron import CronTrigger
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from bot.config import ConfigStore, UserConfig
+from bot.config import UserConfig, get_config_store
+
+# Triggers landing within this many seconds of each other run as one batch
+COALESCE_WINDOW = 2.0
+
+# Posts generated at once (each one is an LLM call)
+MAX_CONCURRENT_POSTS = 4
 
 
 class PostScheduler:
@@ -25,9 +31,13 @@ class PostScheduler:
     def __init__(self):
         """Initialize the scheduler."""
         self.scheduler = AsyncIOScheduler()
-        self.config_store = ConfigStore()
+        self.config_store = get_config_store()
         self._post_callback: Optional[Callable] = None
         self._jobs: dict[int, str] = {}  # chat_id -> job_id
+        self._due: set[int] = set()  # chats triggered but not yet run
+        self._drain_task: Optional[asyncio.Task] = None
+        self._running: set[asyncio.Task] = set()  # batches still generating
+        self._post_semaphore: Optional[asyncio.Semaphore] = None
 
     def set_post_callback(self, callback: Callable) -> None:
         """
@@ -142,6 +152,8 @@ class PostScheduler:
         """
         Trigger post generation for a user.
 
+        Users sharing a time slot are collected and generated as one batch.
+
         Args:
             chat_id: Telegram chat ID
         """
@@ -149,19 +161,47 @@ class PostScheduler:
             print(f"No post callback set, skipping post for chat {chat_id}")
             return
 
-        config = self.config_store.get(chat_id)
+        self._due.add(chat_id)
+        if self._drain_task is None or self._drain_task.done():
+            task = self._drain_task = asyncio.create_task(self._run_due())
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_due(self) -> None:
+        """Wait for the rest of the slot's triggers, then run them concurrently."""
+        await asyncio.sleep(COALESCE_WINDOW)
+
+        due, self._due = self._due, set()
+        # Triggers from here on start the next batch rather than joining
+        # this one (which is no longer collecting)
+        self._drain_task = None
+        if self._post_semaphore is None:
+            self._post_semaphore = asyncio.Semaphore(MAX_CONCURRENT_POSTS)
+
+        print(f"Running {len(due)} scheduled post(s)")
+        await asyncio.gather(*(self._run_one(chat_id) for chat_id in due))
+
+    async def _run_one(self, chat_id: int) -> None:
+        """
+        Generate one user's scheduled post.
+
+        Args:
+            chat_id: Telegram chat ID
+        """
+        config = await self.config_store.aget(chat_id)
 
         # Verify user still has a repo connected
         if not config.github_url:
             print(f"No repo connected for chat {chat_id}, skipping")
             return
 
-        print(f"Triggering daily post for chat {chat_id}")
+        async with self._post_semaphore:
+            print(f"Triggering daily post for chat {chat_id}")
 
-        try:
-            await self._post_callback(chat_id)
-        except Exception as e:
-            print(f"Error generating post for chat {chat_id}: {e}")
+            try:
+                await self._post_callback(chat_id)
+            except Exception as e:
+                print(f"Error generating post for chat {chat_id}: {e}")
 
     def get_next_run(self, chat_id: int) -> Optional[datetime]:
         """
@@ -63,9 +63,9 @@ class MetricsFetcher:
 
         updated = 0
         for post in posts:
-            if post.get("linkedin_post_id") and post.get("posted_at"):
+            if post.linkedin_post_id and post.posted_at:
                 # Only fetch metrics for posts in the last 7 days
-                posted_at = post.get("posted_at")
+                posted_at = post.posted_at
                 if isinstance(posted_at, str):
                     try:
                         posted_dt = datetime.fromisoformat(posted_at.replace("Z", "+00:00"))
@@ -75,8 +75,8 @@ class MetricsFetcher:
                         pass
 
                 metrics = self.fetch_metrics_for_post(
-                    post_id=post["id"],
-                    linkedin_post_id=post["linkedin_post_id"]
+                    post_id=post.id,
+                    linkedin_post_id=post.linkedin_post_id
                 )
                 if metrics:
                     updated += 1
@@ -12,6 +12,8 @@ import requests
 from typing import Optional
 from dataclasses import dataclass
 
+_WORD_RE = re.compile(r'\b\w+\b')
+
 
 @dataclass
 class Trend:
@@ -72,7 +74,7 @@ class HackerNewsTrends:
             return []
 
         text_lower = text.lower()
-        words = set(re.findall(r'\b\w+\b', text_lower))
+        words = set(_WORD_RE.findall(text_lower))
 
         found_keywords = []
         for keyword in self.DEV_KEYWORDS:
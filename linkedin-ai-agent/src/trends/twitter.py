@@ -19,6 +19,8 @@ try:
 except ImportError:
     TWEEPY_AVAILABLE = False
 
+_HASHTAG_RE = re.compile(r'#(\w+)')
+
 
 @dataclass
 class Trend:
@@ -73,7 +75,7 @@ class TwitterTrends:
         keywords = []
 
         # Extract hashtags
-        hashtags = re.findall(r'#(\w+)', text)
+        hashtags = _HASHTAG_RE.findall(text)
         keywords.extend([h.lower() for h in hashtags])
 
         # Check for common dev terms